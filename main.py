@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 import sys
-import os
-
-# Add src to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import argparse
 
 from src.trading_bot import TradingBot
 from src.cli_interface import TradingCLI
 
 def main():
+    parser = argparse.ArgumentParser(description="Binance Futures trading bot")
+    parser.add_argument('--refresh-symbols', action='store_true',
+                        help="discard cached symbol info and refetch it from the exchange")
+    args = parser.parse_args()
+    
     try:
         bot = TradingBot()
-        cli = TradingCLI(bot)
+        cli = TradingCLI(bot, refresh_symbols=args.refresh_symbols)
         cli.run()
     except Exception as e:
         print(f"Failed to initialize: {e}")
@@ -1,24 +1,43 @@
 import time
-import threading
+import itertools
+import asyncio
 import logging
+import threading
+from bisect import bisect_left, bisect_right
+from functools import partial
 from datetime import datetime
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping
 from dataclasses import dataclass
+from .scheduler import schedule, set_event, wait_event, rest_method
+from ..client import BATCH_SIZE
 
-@dataclass
+@dataclass(slots=True)
 class GridLevel:
     price: float
     quantity: float
     side: str
     order_id: int = None
     status: str = 'PENDING'
+    signed_notional: float = 0.0  # P&L contribution when filled: +SELL, -BUY
 
 class GridOrderHandler:
-    def __init__(self, client, limit_order_handler):
+    def __init__(self, client, limit_order_handler, executor=None, user_stream=None,
+                 price_ttl: float = 1.0, async_client=None):
         self.client = client
+        self.async_client = async_client
         self.limit_order_handler = limit_order_handler
+        self.exchange_info = limit_order_handler.exchange_info
+        self.executor = executor
+        self.user_stream = user_stream
         self.logger = logging.getLogger("GridOrder")
         self.grid_strategies = {}
+        self._ids = itertools.count(1)  # keeps same-second IDs unique
+        self.prices = limit_order_handler.prices
+        self.price_ttl = price_ttl
+        
+        if self.user_stream:
+            self.user_stream.add_failure_handler(self._resume_polling)
     
     def create_grid_strategy(self, symbol: str, lower_price: float, upper_price: float, 
                            grid_count: int, total_quantity: float) -> str:
@@ -26,31 +45,45 @@ class GridOrderHandler:
             raise ValueError("Grid count must be at least 2")
         if lower_price >= upper_price:
             raise ValueError("Lower price must be less than upper price")
+        if total_quantity <= 0:
+            raise ValueError("Total quantity must be positive")
         
-        grid_id = f"GRID_{int(time.time())}"
-        price_step = (upper_price - lower_price) / (grid_count - 1)
         quantity_per_level = total_quantity / grid_count
+        min_qty = self._get_min_quantity(symbol)
+        if quantity_per_level < min_qty:
+            raise ValueError(f"Quantity per level {quantity_per_level} is below minimum {min_qty} for {symbol}")
+        
+        now = time.time()
+        grid_id = f"GRID_{int(now)}_{next(self._ids)}"
+        price_step = (upper_price - lower_price) / (grid_count - 1)
+        
+        # Ascending level prices, kept alongside the levels for bisecting at start
+        prices = [lower_price + i * price_step for i in range(grid_count)]
         
-        grid_levels = []
-        for i in range(grid_count):
-            price = lower_price + (i * price_step)
-            side = 'BUY' if i < grid_count // 2 else 'SELL'
-            
-            grid_levels.append(GridLevel(
-                price=price,
-                quantity=quantity_per_level,
-                side=side
-            ))
+        # Lower half buys, upper half sells
+        mid = grid_count // 2
+        grid_levels = [
+            GridLevel(price=price, quantity=quantity_per_level, side='BUY',
+                      signed_notional=-quantity_per_level * price)
+            for price in prices[:mid]
+        ] + [
+            GridLevel(price=price, quantity=quantity_per_level, side='SELL',
+                      signed_notional=quantity_per_level * price)
+            for price in prices[mid:]
+        ]
         
         strategy = {
             'id': grid_id,
             'symbol': symbol,
             'grid_levels': grid_levels,
+            'prices': prices,
             'status': 'CREATED',
-            'created_time': datetime.now(),
+            'created_time': datetime.fromtimestamp(now),
             'active_orders': 0,
             'total_trades': 0,
-            'profit_loss': 0.0
+            'profit_loss': 0.0,
+            'stop_event': asyncio.Event(),
+            'lock': threading.Lock()  # counters/P&L are updated from several threads
         }
         
         self.grid_strategies[grid_id] = strategy
@@ -63,54 +96,124 @@ class GridOrderHandler:
         strategy = self.grid_strategies[grid_id]
         current_price = self._get_current_price(strategy['symbol'])
         
-        # Place initial orders
-        for level in strategy['grid_levels']:
-            if ((level.side == 'BUY' and level.price < current_price) or 
-                (level.side == 'SELL' and level.price > current_price)):
-                
-                try:
-                    order = self.limit_order_handler.place_order(
-                        strategy['symbol'], level.side, level.quantity, level.price
-                    )
-                    level.order_id = order.order_id
-                    level.status = 'PLACED'
-                    strategy['active_orders'] += 1
-                except Exception as e:
-                    self.logger.error(f"Grid order placement error: {e}")
+        levels = strategy['grid_levels']
+        prices = strategy['prices']
+        mid = len(levels) // 2
+        
+        # Prices ascend, so BUYs below and SELLs above the market are contiguous runs
+        eligible = (levels[:min(mid, bisect_left(prices, current_price))] +
+                    levels[max(mid, bisect_right(prices, current_price)):])
+        
+        # Place initial orders BATCH_SIZE per request, batches sent concurrently;
+        # a failed batch or level doesn't stop the rest
+        batches = [eligible[i:i + BATCH_SIZE] for i in range(0, len(eligible), BATCH_SIZE)]
+        mapper = self.executor.map if self.executor else map
+        orders = itertools.chain.from_iterable(
+            mapper(partial(self._place_batch, strategy['symbol']), batches)
+        )
+        for level, order in zip(eligible, orders):
+            if order:
+                level.order_id = order.order_id
+                level.status = 'PLACED'
+                strategy['active_orders'] += 1
         
         strategy['status'] = 'RUNNING'
         self._start_monitoring(grid_id)
         return True
     
+    def _place_batch(self, symbol: str, levels: List[GridLevel]):
+        try:
+            return self.limit_order_handler.place_batch([
+                {'symbol': symbol, 'side': level.side, 'quantity': level.quantity, 'price': level.price}
+                for level in levels
+            ])
+        except Exception as e:
+            self.logger.error("Grid order placement error: %s", e)
+            return [None] * len(levels)
+    
     def _start_monitoring(self, grid_id: str):
-        threading.Thread(target=self._monitor_grid, args=(grid_id,), daemon=True).start()
+        strategy = self.grid_strategies[grid_id]
+        if self._complete_if_idle(strategy):
+            return
+        
+        if self.user_stream and self.user_stream.active:
+            # Fills are pushed by the user data stream; no polling needed
+            strategy['stream_driven'] = True
+            for level in strategy['grid_levels']:
+                if level.status == 'PLACED' and level.order_id:
+                    self.user_stream.register(
+                        level.order_id, partial(self._on_order_update, strategy, level)
+                    )
+        else:
+            strategy['stream_driven'] = False
+            schedule(self._monitor_grid(grid_id))
+    
+    def _resume_polling(self):
+        for grid_id, strategy in list(self.grid_strategies.items()):
+            if strategy['status'] == 'RUNNING' and strategy.get('stream_driven'):
+                strategy['stream_driven'] = False
+                schedule(self._monitor_grid(grid_id))
+    
+    def _on_order_update(self, strategy: Dict[str, Any], level: GridLevel, update: dict):
+        if strategy['status'] == 'RUNNING' and level.status == 'PLACED':
+            self._apply_order_status(strategy, level, update['X'])
+            if level.status != 'PLACED':
+                self.user_stream.unregister(level.order_id)
+    
+    def _apply_order_status(self, strategy: Dict[str, Any], level: GridLevel, status: str):
+        with strategy['lock']:
+            if level.status != 'PLACED':
+                return
+            if status == 'FILLED':
+                level.status = 'FILLED'
+                strategy['active_orders'] -= 1
+                strategy['total_trades'] += 1
+                strategy['profit_loss'] += level.signed_notional
+            elif status in ('CANCELED', 'EXPIRED', 'REJECTED'):
+                level.status = 'CANCELLED'
+                strategy['active_orders'] -= 1
+        self._complete_if_idle(strategy)
+    
+    def _complete_if_idle(self, strategy: Dict[str, Any]) -> bool:
+        """Mark a running grid COMPLETED once no orders remain; True if it is no longer running"""
+        with strategy['lock']:
+            if strategy['status'] == 'RUNNING' and strategy['active_orders'] == 0:
+                strategy['status'] = 'COMPLETED'
+            return strategy['status'] != 'RUNNING'
     
-    def _monitor_grid(self, grid_id: str):
+    async def _monitor_grid(self, grid_id: str):
         strategy = self.grid_strategies[grid_id]
         
+        # Loop-invariant lookups bound once; awaited on the loop when there is an async client
+        rest = partial(rest_method, client=self.client, executor=self.executor, async_client=self.async_client)
+        get_open_orders = partial(rest('futures_get_open_orders'), symbol=strategy['symbol'])
+        get_order = partial(rest('futures_get_order'), symbol=strategy['symbol'])
+        apply_status = self._apply_order_status
+        levels = strategy['grid_levels']
+        stop_event = strategy['stop_event']
+        
         while strategy['status'] == 'RUNNING':
             try:
-                for level in strategy['grid_levels']:
-                    if level.status == 'PLACED' and level.order_id:
-                        order_status = self.client.futures_get_order(
-                            symbol=strategy['symbol'], orderId=level.order_id
-                        )
-                        
-                        if order_status['status'] == 'FILLED':
-                            level.status = 'FILLED'
-                            strategy['active_orders'] -= 1
-                            strategy['total_trades'] += 1
-                            
-                            # Update P&L
-                            if level.side == 'SELL':
-                                strategy['profit_loss'] += level.quantity * level.price
-                            else:
-                                strategy['profit_loss'] -= level.quantity * level.price
+                # One open-orders snapshot per tick instead of one lookup per level
+                open_orders = await get_open_orders()
+                open_ids = {o['orderId'] for o in open_orders}
                 
-                time.sleep(5)
+                for level in levels:
+                    order_id = level.order_id
+                    if level.status == 'PLACED' and order_id and order_id not in open_ids:
+                        # No longer open: confirm whether it filled or was cancelled
+                        order_status = await get_order(orderId=order_id)
+                        apply_status(strategy, level, order_status['status'])
+                
+                # Every order resolved: stop polling instead of ticking idle forever
+                if self._complete_if_idle(strategy):
+                    break
+                
+                if await wait_event(stop_event, 5):
+                    break
                 
             except Exception as e:
-                self.logger.error(f"Grid monitoring error: {e}")
+                self.logger.error("Grid monitoring error: %s", e)
                 break
     
     def stop_grid_strategy(self, grid_id: str) -> bool:
@@ -122,16 +225,30 @@ class GridOrderHandler:
         # Cancel all active orders
         for level in strategy['grid_levels']:
             if level.status == 'PLACED' and level.order_id:
+                if self.user_stream:
+                    self.user_stream.unregister(level.order_id)
                 self.limit_order_handler.cancel_order(strategy['symbol'], level.order_id)
                 level.status = 'CANCELLED'
         
-        strategy['status'] = 'STOPPED'
-        strategy['active_orders'] = 0
+        with strategy['lock']:
+            strategy['status'] = 'STOPPED'
+            strategy['active_orders'] = 0
+        set_event(strategy['stop_event'])
         return True
     
-    def get_grid_strategies(self) -> Dict[str, Dict[str, Any]]:
-        return self.grid_strategies
+    def get_grid_strategies(self) -> Mapping[str, Dict[str, Any]]:
+        # Read-only snapshot: safe to iterate while entries are added elsewhere
+        return MappingProxyType(self.grid_strategies.copy())
+    
+    def _get_min_quantity(self, symbol: str) -> float:
+        """LOT_SIZE minQty for symbol, from the shared exchange info cache"""
+        try:
+            lot_size = self.exchange_info.filters(symbol).get('LOT_SIZE')
+            return float(lot_size['minQty']) if lot_size else 0.0
+        except Exception as e:
+            self.logger.warning("Could not get minimum quantity for %s: %s", symbol, e)
+            return 0.0
     
     def _get_current_price(self, symbol: str) -> float:
-        ticker = self.client.futures_symbol_ticker(symbol=symbol)
-        return float(ticker['price'])
+        """Get ticker price from the shared cache, accepting a value up to price_ttl old"""
+        return self.prices.get(symbol, self.price_ttl)
@@ -1,15 +1,33 @@
 import time
-import threading
+import itertools
+import asyncio
 import logging
+import threading
+from functools import partial
 from datetime import datetime
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+from .scheduler import schedule, set_event, wait_event, rest_method
+
+POLL_INTERVAL = 5  # seconds between polls right after a change
+MAX_POLL_INTERVAL = 60  # ceiling the interval doubles up to while nothing changes
 
 class OCOOrderHandler:
-    def __init__(self, client, limit_order_handler):
+    def __init__(self, client, limit_order_handler, executor=None, user_stream=None, async_client=None):
         self.client = client
+        self.async_client = async_client
         self.limit_order_handler = limit_order_handler
+        self.executor = executor
+        self.user_stream = user_stream
         self.logger = logging.getLogger("OCOOrder")
         self.oco_orders = {}
+        self._ids = itertools.count(1)  # keeps same-second IDs unique
+        # symbol -> {'ocos': [...], 'wake': asyncio.Event}; one poller per symbol while polling
+        self._oco_by_symbol: Dict[str, Dict[str, Any]] = {}
+        self._poll_lock = threading.Lock()
+        
+        if self.user_stream:
+            self.user_stream.add_failure_handler(self._resume_polling)
     
     def place_oco_order(self, symbol: str, side: str, quantity: float, 
                        limit_price: float, stop_price: float, stop_limit_price: float) -> str:
@@ -20,14 +38,15 @@ class OCOOrderHandler:
                 symbol, side, quantity, stop_limit_price, stop_price
             )
             
-            oco_id = f"OCO_{int(time.time())}"
+            now = time.time()
+            oco_id = f"OCO_{int(now)}_{next(self._ids)}"
             oco_data = {
                 'id': oco_id,
                 'symbol': symbol,
                 'limit_order': limit_order,
                 'stop_order': stop_order,
                 'status': 'ACTIVE',
-                'timestamp': datetime.now()
+                'timestamp': datetime.fromtimestamp(now)
             }
             
             self.oco_orders[oco_id] = oco_data
@@ -36,36 +55,101 @@ class OCOOrderHandler:
             return oco_id
             
         except Exception as e:
-            self.logger.error(f"OCO order error: {e}")
+            self.logger.error("OCO order error: %s", e)
             raise
     
     def _start_monitoring(self, oco_data: Dict[str, Any]):
-        threading.Thread(target=self._monitor_oco, args=(oco_data,), daemon=True).start()
+        if self.user_stream and self.user_stream.active:
+            # Fills are pushed by the user data stream; no polling needed
+            oco_data['stream_driven'] = True
+            limit_order = oco_data['limit_order']
+            stop_order = oco_data['stop_order']
+            self.user_stream.register(
+                limit_order.order_id,
+                partial(self._on_order_update, oco_data, 'LIMIT_FILLED', stop_order.order_id)
+            )
+            self.user_stream.register(
+                stop_order.order_id,
+                partial(self._on_order_update, oco_data, 'STOP_FILLED', limit_order.order_id)
+            )
+        else:
+            oco_data['stream_driven'] = False
+            self._poll(oco_data)
+    
+    def _resume_polling(self):
+        for oco_data in list(self.oco_orders.values()):
+            if oco_data['status'] == 'ACTIVE' and oco_data.get('stream_driven'):
+                oco_data['stream_driven'] = False
+                self._poll(oco_data)
     
-    def _monitor_oco(self, oco_data: Dict[str, Any]):
-        while oco_data['status'] == 'ACTIVE':
+    def _poll(self, oco_data: Dict[str, Any]):
+        """Add an OCO to its symbol's shared poller, starting one if none is running"""
+        symbol = oco_data['symbol']
+        with self._poll_lock:
+            watch = self._oco_by_symbol.get(symbol)
+            if watch is None:
+                watch = self._oco_by_symbol[symbol] = {'ocos': [oco_data], 'wake': asyncio.Event()}
+                schedule(self._monitor_symbol(symbol, watch))
+                return
+            watch['ocos'].append(oco_data)
+        set_event(watch['wake'])  # a new OCO is a change: poll now and reset the backoff
+    
+    def _on_order_update(self, oco_data: Dict[str, Any], filled_status: str,
+                         sibling_id: int, update: dict):
+        if oco_data['status'] == 'ACTIVE' and update['X'] == 'FILLED':
+            oco_data['status'] = filled_status
+            self.user_stream.unregister(oco_data['limit_order'].order_id)
+            self.user_stream.unregister(oco_data['stop_order'].order_id)
+            # Cancel off the socket thread so the stream keeps flowing
+            schedule(self._cancel_leg(oco_data['symbol'], sibling_id))
+    
+    async def _cancel_leg(self, symbol: str, order_id: int):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.limit_order_handler.cancel_order, symbol, order_id)
+    
+    async def _monitor_symbol(self, symbol: str, watch: Dict[str, Any]):
+        """Poll every actively watched OCO on symbol with one open-orders call per tick"""
+        rest = partial(rest_method, client=self.client, executor=self.executor, async_client=self.async_client)
+        get_open_orders = rest('futures_get_open_orders')
+        get_order = rest('futures_get_order')
+        interval = POLL_INTERVAL
+        
+        while True:
+            with self._poll_lock:
+                watch['ocos'] = active = [o for o in watch['ocos'] if o['status'] == 'ACTIVE']
+                if not active:
+                    del self._oco_by_symbol[symbol]
+                    return
+            watch['wake'].clear()
+            changed = False
+            
             try:
-                symbol = oco_data['symbol']
-                limit_order = oco_data['limit_order']
-                stop_order = oco_data['stop_order']
-                
-                limit_status = self.client.futures_get_order(symbol=symbol, orderId=limit_order.order_id)
-                stop_status = self.client.futures_get_order(symbol=symbol, orderId=stop_order.order_id)
+                open_orders = await get_open_orders(symbol=symbol)
+                open_ids = {o['orderId'] for o in open_orders}
                 
-                if limit_status['status'] == 'FILLED':
-                    self.limit_order_handler.cancel_order(symbol, stop_order.order_id)
-                    oco_data['status'] = 'LIMIT_FILLED'
-                    break
-                elif stop_status['status'] == 'FILLED':
-                    self.limit_order_handler.cancel_order(symbol, limit_order.order_id)
-                    oco_data['status'] = 'STOP_FILLED'
-                    break
-                    
-                time.sleep(5)
+                for oco_data in active:
+                    limit_order = oco_data['limit_order']
+                    stop_order = oco_data['stop_order']
+                    # Only orders that left the book need a status lookup
+                    for leg, sibling, filled_status in ((limit_order, stop_order, 'LIMIT_FILLED'),
+                                                        (stop_order, limit_order, 'STOP_FILLED')):
+                        if leg.order_id in open_ids:
+                            continue
+                        leg_status = await get_order(symbol=symbol, orderId=leg.order_id)
+                        if leg_status['status'] == 'FILLED':
+                            await self._cancel_leg(symbol, sibling.order_id)
+                            oco_data['status'] = filled_status
+                            changed = True
+                            break
                 
             except Exception as e:
-                self.logger.error(f"OCO monitoring error: {e}")
-                break
+                self.logger.error("OCO monitoring error: %s", e)
+            
+            # Back off while the book is quiet; any fill or new OCO resets to POLL_INTERVAL
+            delay = POLL_INTERVAL if changed else interval
+            woken = await wait_event(watch['wake'], delay)
+            interval = POLL_INTERVAL if woken or changed else min(delay * 2, MAX_POLL_INTERVAL)
     
-    def get_oco_orders(self) -> Dict[str, Dict[str, Any]]:
-        return self.oco_orders
+    def get_oco_orders(self) -> Mapping[str, Dict[str, Any]]:
+        # Read-only snapshot: safe to iterate while entries are added elsewhere
+        return MappingProxyType(self.oco_orders.copy())
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from functools import partial
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared monitor loop, starting its thread on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="monitor-loop", daemon=True).start()
+    return _loop
+
+
+def on_loop_thread() -> bool:
+    """True when called from the monitor loop itself, where blocking on schedule() would deadlock"""
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def schedule(coro):
+    """Run a coroutine on the shared monitor loop from any thread"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def set_event(event: asyncio.Event):
+    """Set an asyncio.Event owned by the monitor loop from any thread"""
+    get_loop().call_soon_threadsafe(event.set)
+
+
+async def wait_event(event: asyncio.Event, timeout: float) -> bool:
+    """Sleep up to timeout seconds, returning True early if the event is set"""
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def rest_method(name: str, client, executor=None, async_client=None):
+    """Awaitable client method `name`: the AsyncClient's when one is given, else the
+    blocking client's run on executor, so callers await either the same way"""
+    if async_client is not None:
+        return getattr(async_client, name)
+    fn = getattr(client, name)
+    
+    async def call(**params):
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, **params))
+    return call
@@ -1,23 +1,38 @@
 import time
-import threading
+import itertools
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from decimal import Decimal, ROUND_DOWN
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping
+from .scheduler import schedule, set_event, wait_event
+from ..client import BATCH_SIZE
 
 class TWAPOrderHandler:
-    def __init__(self, market_order_handler):
+    def __init__(self, market_order_handler, executor=None):
         self.market_order_handler = market_order_handler
+        self.executor = executor
         self.logger = logging.getLogger("TWAPOrder")
         self.twap_jobs = {}
+        self._ids = itertools.count(1)  # keeps same-second IDs unique
     
     def start_twap_order(self, symbol: str, side: str, total_quantity: float, 
-                        duration_minutes: int, interval_minutes: int = 1) -> str:
+                        duration_minutes: int, interval_minutes: int = 1, burst: bool = False) -> str:
+        """
+        Split total_quantity into one market order per interval over duration_minutes.
+        With burst, up to BATCH_SIZE consecutive slices go out together in one batch
+        request, sent when the first of them is due.
+        """
         if duration_minutes <= 0 or interval_minutes <= 0:
             raise ValueError("Duration and interval must be positive")
-        
-        job_id = f"TWAP_{int(time.time())}"
         parts = duration_minutes // interval_minutes
-        qty_per_part = total_quantity / parts
+        if parts == 0:
+            raise ValueError("Duration must be at least one interval")
+        slices = self._slice_quantity(symbol, total_quantity, parts)
+        
+        now = time.time()
+        job_id = f"TWAP_{int(now)}_{next(self._ids)}"
         
         job = {
             'id': job_id,
@@ -25,12 +40,18 @@ class TWAPOrderHandler:
             'side': side,
             'total_quantity': total_quantity,
             'parts': parts,
-            'qty_per_part': qty_per_part,
+            'qty_per_part': slices[0],
+            'slices': slices,
             'interval_minutes': interval_minutes,
+            'slices_per_batch': BATCH_SIZE if burst else 1,
             'completed': 0,
             'status': 'RUNNING',
-            'start_time': datetime.now(),
-            'orders': []
+            'start_time': datetime.fromtimestamp(now),
+            'orders': [],
+            'filled_qty': 0.0,
+            'filled_cost': 0.0,
+            'avg_price': 0.0,
+            'cancel_event': asyncio.Event()
         }
         
         self.twap_jobs[job_id] = job
@@ -38,39 +59,97 @@ class TWAPOrderHandler:
         
         return job_id
     
+    def _slice_quantity(self, symbol: str, total_quantity: float, parts: int) -> List[float]:
+        """
+        Equal slices rounded down to a multiple of the symbol's LOT_SIZE step, with
+        the rounding remainder on the last one so the slices sum to the total
+        (itself rounded down to the step) exactly.
+        """
+        try:
+            step = self.market_order_handler.exchange_info.quantity_step(symbol)
+        except Exception as e:
+            self.logger.warning("Could not get quantity step for %s: %s", symbol, e)
+            step = None
+        if step is None:
+            return [total_quantity / parts] * parts
+        
+        # Whole multiples of step, not just its decimal places: 0.5 or 5 steps need it too
+        total = (Decimal(str(total_quantity)) / step).to_integral_value(ROUND_DOWN) * step
+        if total != Decimal(str(total_quantity)):
+            self.logger.warning("TWAP total %s rounded down to the %s lot step: %s",
+                                total_quantity, step, total)
+        per = (total / parts / step).to_integral_value(ROUND_DOWN) * step
+        if per <= 0:
+            raise ValueError(f"Total quantity {total_quantity} is too small to split into {parts} parts")
+        return [float(per)] * (parts - 1) + [float(total - per * (parts - 1))]
+    
     def _start_execution(self, job: Dict[str, Any]):
-        threading.Thread(target=self._execute_twap, args=(job,), daemon=True).start()
+        # Runs on the shared monitor loop; the future resolves once the job stops
+        job['future'] = schedule(self._execute_twap(job))
     
-    def _execute_twap(self, job: Dict[str, Any]):
+    async def _execute_twap(self, job: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
         try:
-            for i in range(job['parts']):
+            parts = job['parts']
+            slices = job['slices']
+            step = job['slices_per_batch']
+            interval = job['interval_minutes'] * 60
+            # Slice i is due at t0 + i * interval, so order latency never pushes the schedule back
+            t0 = loop.time()
+            for start in range(0, parts, step):
                 if job['status'] != 'RUNNING':
                     break
                 
-                order = self.market_order_handler.place_order(
-                    job['symbol'], job['side'], job['qty_per_part']
-                )
+                count = min(step, parts - start)
+                if count == 1:
+                    orders = [await loop.run_in_executor(
+                        self.executor, self.market_order_handler.place_order,
+                        job['symbol'], job['side'], slices[start]
+                    )]
+                else:
+                    # Consecutive slices folded into one signed request
+                    orders = await loop.run_in_executor(
+                        self.executor, self.market_order_handler.place_batch,
+                        job['symbol'], job['side'], slices[start:start + count]
+                    )
                 
-                job['orders'].append(order)
-                job['completed'] += 1
+                for order in filter(None, orders):
+                    job['orders'].append(order)
+                    job['completed'] += 1
+                    
+                    # Running average fill price, so status views don't rescan all fills
+                    job['filled_qty'] += order.quantity
+                    if order.price:
+                        job['filled_cost'] += order.quantity * order.price
+                job['avg_price'] = job['filled_cost'] / job['filled_qty'] if job['filled_qty'] > 0 else 0.0
                 
-                if i < job['parts'] - 1:
-                    time.sleep(job['interval_minutes'] * 60)
+                # A rejected slice fails the job, as a rejected single order would
+                rejected = orders.count(None)
+                if rejected:
+                    raise RuntimeError(f"{rejected} of {count} TWAP slices rejected")
+                
+                if start + count < parts:
+                    due = t0 + (start + count) * interval
+                    if await wait_event(job['cancel_event'], max(due - loop.time(), 0)):
+                        break
             
-            job['status'] = 'COMPLETED'
+            if job['status'] == 'RUNNING':
+                job['status'] = 'COMPLETED'
             
         except Exception as e:
             job['status'] = 'FAILED'
             job['error'] = str(e)
-            self.logger.error(f"TWAP error: {e}")
+            self.logger.error("TWAP error: %s", e)
     
-    def get_twap_jobs(self) -> Dict[str, Dict[str, Any]]:
-        return self.twap_jobs
+    def get_twap_jobs(self) -> Mapping[str, Dict[str, Any]]:
+        # Read-only snapshot: safe to iterate while entries are added elsewhere
+        return MappingProxyType(self.twap_jobs.copy())
     
     def cancel_twap_job(self, job_id: str) -> bool:
         if job_id in self.twap_jobs:
             job = self.twap_jobs[job_id]
             if job['status'] == 'RUNNING':
                 job['status'] = 'CANCELLED'
+                set_event(job['cancel_event'])
                 return True
         return False
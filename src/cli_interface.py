@@ -1,131 +1,259 @@
 import sys
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 from colorama import Fore, Style, init
 from tabulate import tabulate
+from . import symbol_cache
+from .client import BATCH_SIZE
+
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.formatted_text import ANSI
+    from prompt_toolkit.patch_stdout import patch_stdout
+except ImportError:  # fall back to plain input()
+    PromptSession = None
 
 init(autoreset=True)
 
+# Escape sequences bound once instead of resolved through colorama on every message
+_RED, _GREEN, _YELLOW, _BLUE, _CYAN = Fore.RED, Fore.GREEN, Fore.YELLOW, Fore.BLUE, Fore.CYAN
+_RESET = Style.RESET_ALL
+
+_MENU_STR = "\n".join([
+    f"\n{_YELLOW}MENU{_RESET}",
+    f"{_GREEN}1.{_RESET} Market Order",
+    f"{_GREEN}2.{_RESET} Limit Order",
+    f"{_GREEN}3.{_RESET} OCO Order",
+    f"{_GREEN}4.{_RESET} TWAP Order",
+    f"{_GREEN}5.{_RESET} Grid Strategy",
+    f"{_BLUE}6.{_RESET} Balance",
+    f"{_BLUE}7.{_RESET} Live Price",
+    f"{_BLUE}8.{_RESET} Order History",
+    f"{_BLUE}9.{_RESET} Status",
+    f"{_RED}10.{_RESET} Exit",
+]) + "\n"
+_CHOICE_PROMPT = f"\n{_CYAN}Enter choice (1-10): {_RESET}"
+_HEADER_STR = f"\n{_CYAN}BINANCE TRADING BOT{_RESET}\n"
+_INVALID_CHOICE = f"{_RED}Invalid choice{_RESET}"
+_INVALID_SIDE = f"{_RED}Invalid side. Must be BUY or SELL{_RESET}"
+
+PRICE_REFRESH = 0.05  # seconds between live price redraws
+
+_VALID_SIDES = frozenset(('BUY', 'SELL'))
+
+# Status line templates, filled straight from each job/strategy dict
+_ORDER_FMT = "  {symbol} {side} {quantity:.6f} @ {price} (Total: {total})"
+_TWAP_FMT = "  {id}: {status} ({completed}/{parts}) Avg: {avg_price:.4f}"
+_OCO_FMT = "  {id}: {status}"
+_GRID_FMT = "  {id}: {status} (Trades: {total_trades}, P&L: {profit_loss:.4f})"
+
+# Numeric columns stay right-aligned now that tabulate no longer detects them
+_BALANCE_ALIGN = ('left', 'right', 'right')
+_HISTORY_ALIGN = ('left', 'left', 'left', 'right', 'right', 'left', 'left', 'left')
+
+
+@lru_cache(maxsize=4096)
+def _round(value: float, precision: int) -> float:
+    return round(value, precision)
+
+
+@lru_cache(maxsize=1024)
+def _fmt_ts(sec: int) -> str:
+    # Orders placed in bursts (TWAP slices, grid levels) share a second
+    return datetime.fromtimestamp(sec).strftime('%Y-%m-%d %H:%M:%S')
+
+
 class TradingCLI:
-    def __init__(self, bot):
+    def __init__(self, bot, refresh_symbols=False):
         self.bot = bot
         self.symbol_info_cache = {}
+        self._symbol_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cli')  # overlaps lookups on cold caches
+        # A prompt session lets background threads print without corrupting the input line
+        self._session = PromptSession() if PromptSession and sys.stdin.isatty() and sys.stdout.isatty() else None
+        if refresh_symbols:
+            symbol_cache.clear()
+        threading.Thread(target=self._warm_symbol_cache, daemon=True).start()
+        
+        # Menu choice -> handler, built once; '10' (exit) is handled by the loop itself
+        self._dispatch = {
+            '1': self._handle_market_order,
+            '2': self._handle_limit_order,
+            '3': self._handle_oco_order,
+            '4': self._handle_twap_order,
+            '5': self._handle_grid_strategy,
+            '6': self._handle_balance,
+            '7': self._handle_price,
+            '8': self._handle_order_history,
+            '9': self._handle_status,
+        }
     
     def run(self):
+        with self._patched_stdout():
+            self._run()
+    
+    def _run(self):
         self._print_header()
         
         while True:
             try:
                 self._print_menu()
-                choice = input(f"\n{Fore.CYAN}Enter choice (1-10): {Style.RESET_ALL}").strip()
+                choice = self._read_line(_CHOICE_PROMPT).strip()
                 
-                if choice == '1':
-                    self._handle_market_order()
-                elif choice == '2':
-                    self._handle_limit_order()
-                elif choice == '3':
-                    self._handle_oco_order()
-                elif choice == '4':
-                    self._handle_twap_order()
-                elif choice == '5':
-                    self._handle_grid_strategy()
-                elif choice == '6':
-                    self._handle_balance()
-                elif choice == '7':
-                    self._handle_price()
-                elif choice == '8':
-                    self._handle_order_history()
-                elif choice == '9':
-                    self._handle_status()
+                handler = self._dispatch.get(choice)
+                if handler:
+                    handler()
                 elif choice == '10':
-                    print(f"\n{Fore.YELLOW}Exiting...{Style.RESET_ALL}")
+                    print(f"\n{_YELLOW}Exiting...{_RESET}")
                     break
                 else:
-                    print(f"{Fore.RED}Invalid choice{Style.RESET_ALL}")
+                    print(_INVALID_CHOICE)
                     
             except KeyboardInterrupt:
-                print(f"\n{Fore.YELLOW}Exiting...{Style.RESET_ALL}")
+                print(f"\n{_YELLOW}Exiting...{_RESET}")
                 break
             except Exception as e:
-                print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
+                print(f"{_RED}Error: {e}{_RESET}")
     
     def _print_header(self):
-        print(f"\n{Fore.CYAN}BINANCE TRADING BOT{Style.RESET_ALL}")
+        sys.stdout.write(_HEADER_STR)
     
     def _print_menu(self):
-        print(f"\n{Fore.YELLOW}MENU{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}1.{Style.RESET_ALL} Market Order")
-        print(f"{Fore.GREEN}2.{Style.RESET_ALL} Limit Order")
-        print(f"{Fore.GREEN}3.{Style.RESET_ALL} OCO Order")
-        print(f"{Fore.GREEN}4.{Style.RESET_ALL} TWAP Order")
-        print(f"{Fore.GREEN}5.{Style.RESET_ALL} Grid Strategy")
-        print(f"{Fore.BLUE}6.{Style.RESET_ALL} Balance")
-        print(f"{Fore.BLUE}7.{Style.RESET_ALL} Live Price")
-        print(f"{Fore.BLUE}8.{Style.RESET_ALL} Order History")
-        print(f"{Fore.BLUE}9.{Style.RESET_ALL} Status")
-        print(f"{Fore.RED}10.{Style.RESET_ALL} Exit")
+        sys.stdout.write(_MENU_STR)
+        sys.stdout.flush()
+    
+    def _print_table(self, rows, headers, title=None, colalign=None):
+        """Render a grid table (with optional title line) and emit it in a single write"""
+        # Cells arrive preformatted, so tabulate's per-cell number sniffing is skipped
+        table = tabulate(rows, headers=headers, tablefmt='grid', disable_numparse=True, colalign=colalign)
+        sys.stdout.write(f"\n{title}\n{table}\n" if title else f"{table}\n")
+        sys.stdout.flush()
+    
+    def _write_lines(self, lines):
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    @contextmanager
+    def _patched_stdout(self):
+        """Route stdout (including the log stream handler) above the active prompt"""
+        if not self._session:
+            yield
+            return
+        
+        original = sys.stdout
+        with patch_stdout(raw=True):
+            # The console handler sits behind the bot's queue listener, if it has one
+            listener = getattr(self.bot, 'log_listener', None)
+            candidates = logging.getLogger().handlers + list(listener.handlers if listener else ())
+            handlers = [h for h in candidates
+                        if isinstance(h, logging.StreamHandler) and h.stream is original]
+            for h in handlers:
+                h.setStream(sys.stdout)
+            try:
+                yield
+            finally:
+                for h in handlers:
+                    h.setStream(original)
+    
+    def _read_line(self, prompt: str) -> str:
+        if self._session:
+            return self._session.prompt(ANSI(prompt))
+        return input(prompt)
     
     def _get_input(self, prompt: str, input_type=str):
         try:
-            value = input(f"{Fore.CYAN}{prompt}{Style.RESET_ALL}")
+            value = self._read_line(f"{_CYAN}{prompt}{_RESET}")
             if input_type == str:
                 return value.strip().upper()
             else:
-                return input_type(value.strip())
+                return input_type(value)  # int()/float() already ignore surrounding whitespace
         except ValueError:
-            print(f"{Fore.RED}Invalid input format{Style.RESET_ALL}")
+            print(f"{_RED}Invalid input format{_RESET}")
             return None
         except Exception as e:
-            print(f"{Fore.RED}Input error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Input error: {e}{_RESET}")
             return None
     
+    def _warm_symbol_cache(self):
+        """Prefetch info for every symbol so first use of a symbol doesn't hit the network"""
+        try:
+            all_info = self.bot.get_all_symbol_info()
+        except Exception:
+            return  # lazy per-symbol fetching still works
+        with self._symbol_lock:
+            for symbol, info in all_info.items():
+                self.symbol_info_cache.setdefault(symbol, info)
+    
     def _get_symbol_info(self, symbol):
-        """Get and cache symbol information"""
-        if symbol not in self.symbol_info_cache:
+        """Get and cache symbol information (memory, then disk, then exchange)"""
+        with self._symbol_lock:
+            info = self.symbol_info_cache.get(symbol)
+        if info:
+            return info
+        
+        info = symbol_cache.load(symbol)
+        if not info:
             try:
                 info = self.bot.get_symbol_info(symbol)
-                if info:
-                    self.symbol_info_cache[symbol] = info
-                else:
-                    print(f"{Fore.RED}No information available for {symbol}{Style.RESET_ALL}")
-                    return None
             except Exception as e:
-                print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
+                print(f"{_RED}Error: {e}{_RESET}")
                 return None
-        return self.symbol_info_cache[symbol]
+            if not info:
+                print(f"{_RED}No information available for {symbol}{_RESET}")
+                return None
+            symbol_cache.store(symbol, info)
+        
+        with self._symbol_lock:
+            self.symbol_info_cache[symbol] = info
+        return info
+    
+    def _symbol_precision(self, symbol, field):
+        info = self._get_symbol_info(symbol)
+        return info.get(field, 8) if info else 8
     
     def _format_price(self, symbol, price):
         """Format price according to symbol's precision"""
         if price is None:
             return None
-        info = self._get_symbol_info(symbol)
-        precision = info.get('price_precision', 8) if info else 8
-        return round(float(price), precision)
+        return _round(float(price), self._symbol_precision(symbol, 'price_precision'))
     
     def _format_quantity(self, symbol, quantity):
         """Format quantity according to symbol's precision"""
         if quantity is None:
             return None
-        info = self._get_symbol_info(symbol)
-        precision = info.get('quantity_precision', 8) if info else 8
-        return round(float(quantity), precision)
+        return _round(float(quantity), self._symbol_precision(symbol, 'quantity_precision'))
     
-    def _validate_order_params(self, symbol, quantity, price=None):
-        """Validate order parameters"""
+    def _bounds(self, symbol):
+        """(min_qty, max_qty, min_price, max_price) for symbol, or None if info is unavailable"""
         info = self._get_symbol_info(symbol)
         if not info:
+            return None
+        return (info.get('min_quantity', 0), info.get('max_quantity'),
+                info.get('min_price', 0), info.get('max_price'))
+    
+    @staticmethod
+    def _check(bounds, quantity, prices=()):
+        """Validate quantity and each (name, price) pair against precomputed bounds"""
+        if bounds is None:
             return False, "Could not fetch symbol information"
+        min_qty, max_qty, min_price, max_price = bounds
         
-        if quantity < info.get('min_quantity', 0):
+        if quantity < min_qty:
             return False, f"Quantity {quantity} too low"
-            
-        if info.get('max_quantity') and quantity > info['max_quantity']:
+        if max_qty and quantity > max_qty:
             return False, f"Quantity {quantity} too high"
-            
-        if price:
-            if price < info.get('min_price', 0):
-                return False, f"Price {price} too low"
-            if info.get('max_price') and price > info['max_price']:
-                return False, f"Price {price} too high"
-                
+        
+        for name, price in prices:
+            if price < min_price:
+                return False, f"{name} {price} too low"
+            if max_price and price > max_price:
+                return False, f"{name} {price} too high"
+        
         return True, "Valid"
     
     def _display_symbol_info(self, symbol):
@@ -143,16 +271,15 @@ class TradingCLI:
             if 'max_price' in info:
                 data.append(['Max Price', info['max_price']])
                 
-            print(f"\n{Fore.YELLOW}Symbol Information:{Style.RESET_ALL}")
-            print(tabulate(data, headers=['Parameter', 'Value'], tablefmt='grid'))
+            self._print_table(data, ['Parameter', 'Value'], f"{_YELLOW}Symbol Information:{_RESET}")
     
     def _handle_market_order(self):
         symbol = self._get_input("Symbol (e.g., BTCUSDT): ")
         if not symbol: return
         
         side = self._get_input("Side (BUY/SELL): ")
-        if not side or side not in ['BUY', 'SELL']: 
-            print(f"{Fore.RED}Invalid side. Must be BUY or SELL{Style.RESET_ALL}")
+        if not side or side not in _VALID_SIDES: 
+            print(_INVALID_SIDE)
             return
         
         # ...removed symbol info display...
@@ -163,32 +290,32 @@ class TradingCLI:
         # Format quantity according to symbol requirements
         formatted_quantity = self._format_quantity(symbol, quantity)
         if formatted_quantity is None:
-            print(f"{Fore.RED}Error formatting quantity{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting quantity{_RESET}")
             return
         
         # Validate parameters
-        valid, message = self._validate_order_params(symbol, formatted_quantity)
+        valid, message = self._check(self._bounds(symbol), formatted_quantity)
         if not valid:
-            print(f"{Fore.RED}Validation error: {message}{Style.RESET_ALL}")
+            print(f"{_RED}Validation error: {message}{_RESET}")
             return
         
         if formatted_quantity != quantity:
-            print(f"{Fore.YELLOW}Quantity adjusted to {formatted_quantity} to meet symbol requirements{Style.RESET_ALL}")
+            print(f"{_YELLOW}Quantity adjusted to {formatted_quantity} to meet symbol requirements{_RESET}")
     
         try:
             order = self.bot.market_orders.place_order(symbol, side, formatted_quantity)
             self.bot.order_history.append(order)
             self._display_order_result(order)
         except Exception as e:
-            print(f"{Fore.RED}Market order error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Market order error: {e}{_RESET}")
     
     def _handle_limit_order(self):
         symbol = self._get_input("Symbol: ")
         if not symbol: return
         
         side = self._get_input("Side (BUY/SELL): ")
-        if not side or side not in ['BUY', 'SELL']: 
-            print(f"{Fore.RED}Invalid side. Must be BUY or SELL{Style.RESET_ALL}")
+        if not side or side not in _VALID_SIDES: 
+            print(_INVALID_SIDE)
             return
         
         # ...removed symbol info display...
@@ -196,22 +323,25 @@ class TradingCLI:
         quantity = self._get_input("Quantity: ", float)
         if not quantity: return
         
+        # Fetch the price while symbol info is resolved for formatting
+        price_future = self._pool.submit(self.bot.get_current_price, symbol)
+        
         # Format quantity according to symbol requirements
         formatted_quantity = self._format_quantity(symbol, quantity)
         if formatted_quantity is None:
-            print(f"{Fore.RED}Error formatting quantity{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting quantity{_RESET}")
             return
         
         if formatted_quantity != quantity:
-            print(f"{Fore.YELLOW}Quantity adjusted to {formatted_quantity} to meet symbol requirements{Style.RESET_ALL}")
+            print(f"{_YELLOW}Quantity adjusted to {formatted_quantity} to meet symbol requirements{_RESET}")
         
         # Display current price before asking for limit price
         try:
-            current_price = self.bot.get_current_price(symbol)
+            current_price = price_future.result()
             formatted_current_price = self._format_price(symbol, current_price)
-            print(f"{Fore.YELLOW}Current {symbol} price: {formatted_current_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Current {symbol} price: {formatted_current_price}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}Error getting current price: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Error getting current price: {e}{_RESET}")
             return
             
         price = self._get_input("Limit Price: ", float)
@@ -220,32 +350,32 @@ class TradingCLI:
         # Format price according to symbol requirements
         formatted_price = self._format_price(symbol, price)
         if formatted_price is None:
-            print(f"{Fore.RED}Error formatting price{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting price{_RESET}")
             return
         
         # Validate parameters
-        valid, message = self._validate_order_params(symbol, formatted_quantity, formatted_price)
+        valid, message = self._check(self._bounds(symbol), formatted_quantity, (("Price", formatted_price),))
         if not valid:
-            print(f"{Fore.RED}Validation error: {message}{Style.RESET_ALL}")
+            print(f"{_RED}Validation error: {message}{_RESET}")
             return
         
         if formatted_price != price:
-            print(f"{Fore.YELLOW}Price adjusted to {formatted_price} to meet symbol requirements{Style.RESET_ALL}")
+            print(f"{_YELLOW}Price adjusted to {formatted_price} to meet symbol requirements{_RESET}")
     
         try:
             order = self.bot.limit_orders.place_order(symbol, side, formatted_quantity, formatted_price)
             self.bot.order_history.append(order)
             self._display_order_result(order)
         except Exception as e:
-            print(f"{Fore.RED}Limit order error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Limit order error: {e}{_RESET}")
     
     def _handle_oco_order(self):
         symbol = self._get_input("Symbol: ")
         if not symbol: return
         
         side = self._get_input("Side (BUY/SELL): ")
-        if not side or side not in ['BUY', 'SELL']: 
-            print(f"{Fore.RED}Invalid side. Must be BUY or SELL{Style.RESET_ALL}")
+        if not side or side not in _VALID_SIDES: 
+            print(_INVALID_SIDE)
             return
         
         # ...removed symbol info display...
@@ -253,22 +383,25 @@ class TradingCLI:
         quantity = self._get_input("Quantity: ", float)
         if not quantity: return
         
+        # Fetch the price while symbol info is resolved for formatting
+        price_future = self._pool.submit(self.bot.get_current_price, symbol)
+        
         # Format quantity according to symbol requirements
         formatted_quantity = self._format_quantity(symbol, quantity)
         if formatted_quantity is None:
-            print(f"{Fore.RED}Error formatting quantity{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting quantity{_RESET}")
             return
             
         if formatted_quantity != quantity:
-            print(f"{Fore.YELLOW}Quantity adjusted to {formatted_quantity} to meet symbol requirements{Style.RESET_ALL}")
+            print(f"{_YELLOW}Quantity adjusted to {formatted_quantity} to meet symbol requirements{_RESET}")
         
         # Display current price for reference
         try:
-            current_price = self.bot.get_current_price(symbol)
+            current_price = price_future.result()
             formatted_current_price = self._format_price(symbol, current_price)
-            print(f"{Fore.YELLOW}Current {symbol} price: {formatted_current_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Current {symbol} price: {formatted_current_price}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}Error getting current price: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Error getting current price: {e}{_RESET}")
             return
         
         limit_price = self._get_input("Limit price: ", float)
@@ -286,32 +419,35 @@ class TradingCLI:
         formatted_stop_limit_price = self._format_price(symbol, stop_limit_price)
         
         if any(p is None for p in [formatted_limit_price, formatted_stop_price, formatted_stop_limit_price]):
-            print(f"{Fore.RED}Error formatting prices{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting prices{_RESET}")
             return
         
         # Validate all parameters
-        for price_name, price_val in [("limit", formatted_limit_price), ("stop", formatted_stop_price), ("stop_limit", formatted_stop_limit_price)]:
-            valid, message = self._validate_order_params(symbol, formatted_quantity, price_val)
-            if not valid:
-                print(f"{Fore.RED}Validation error for {price_name} price: {message}{Style.RESET_ALL}")
-                return
+        valid, message = self._check(self._bounds(symbol), formatted_quantity, (
+            ("Limit price", formatted_limit_price),
+            ("Stop price", formatted_stop_price),
+            ("Stop limit price", formatted_stop_limit_price),
+        ))
+        if not valid:
+            print(f"{_RED}Validation error: {message}{_RESET}")
+            return
         
         # Show adjustments if any
         if formatted_limit_price != limit_price:
-            print(f"{Fore.YELLOW}Limit price adjusted to {formatted_limit_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Limit price adjusted to {formatted_limit_price}{_RESET}")
         if formatted_stop_price != stop_price:
-            print(f"{Fore.YELLOW}Stop price adjusted to {formatted_stop_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Stop price adjusted to {formatted_stop_price}{_RESET}")
         if formatted_stop_limit_price != stop_limit_price:
-            print(f"{Fore.YELLOW}Stop limit price adjusted to {formatted_stop_limit_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Stop limit price adjusted to {formatted_stop_limit_price}{_RESET}")
         
         # Validate OCO price logic
         if side == 'SELL':
             if formatted_limit_price <= formatted_stop_price:
-                print(f"{Fore.RED}For SELL orders: Limit price must be > Stop price{Style.RESET_ALL}")
+                print(f"{_RED}For SELL orders: Limit price must be > Stop price{_RESET}")
                 return
         else:  # BUY
             if formatted_limit_price >= formatted_stop_price:
-                print(f"{Fore.RED}For BUY orders: Limit price must be < Stop price{Style.RESET_ALL}")
+                print(f"{_RED}For BUY orders: Limit price must be < Stop price{_RESET}")
                 return
         
         try:
@@ -319,17 +455,17 @@ class TradingCLI:
                 symbol, side, formatted_quantity, formatted_limit_price, 
                 formatted_stop_price, formatted_stop_limit_price
             )
-            print(f"{Fore.GREEN}OCO order placed successfully: {oco_id}{Style.RESET_ALL}")
+            print(f"{_GREEN}OCO order placed successfully: {oco_id}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}OCO order error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}OCO order error: {e}{_RESET}")
     
     def _handle_twap_order(self):
         symbol = self._get_input("Symbol: ")
         if not symbol: return
         
         side = self._get_input("Side (BUY/SELL): ")
-        if not side or side not in ['BUY', 'SELL']: 
-            print(f"{Fore.RED}Invalid side. Must be BUY or SELL{Style.RESET_ALL}")
+        if not side or side not in _VALID_SIDES: 
+            print(_INVALID_SIDE)
             return
         
         # ...removed symbol info display...
@@ -340,28 +476,33 @@ class TradingCLI:
         # Format quantity
         formatted_total_quantity = self._format_quantity(symbol, total_quantity)
         if formatted_total_quantity is None:
-            print(f"{Fore.RED}Error formatting quantity{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting quantity{_RESET}")
             return
             
         if formatted_total_quantity != total_quantity:
-            print(f"{Fore.YELLOW}Total quantity adjusted to {formatted_total_quantity}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Total quantity adjusted to {formatted_total_quantity}{_RESET}")
         
         duration = self._get_input("Duration (minutes): ", int)
         if not duration or duration <= 0: 
-            print(f"{Fore.RED}Duration must be positive{Style.RESET_ALL}")
+            print(f"{_RED}Duration must be positive{_RESET}")
             return
         
         # Validate parameters
-        valid, message = self._validate_order_params(symbol, formatted_total_quantity)
+        valid, message = self._check(self._bounds(symbol), formatted_total_quantity)
         if not valid:
-            print(f"{Fore.RED}Validation error: {message}{Style.RESET_ALL}")
+            print(f"{_RED}Validation error: {message}{_RESET}")
             return
         
+        # Burst: up to BATCH_SIZE slices go out in one batch request, when the first is due
+        burst = self._get_input(f"Burst mode, {BATCH_SIZE} slices per request? (y/N): ") == 'Y'
+        
         try:
-            job_id = self.bot.twap_orders.start_twap_order(symbol, side, formatted_total_quantity, duration)
-            print(f"{Fore.GREEN}TWAP order started successfully: {job_id}{Style.RESET_ALL}")
+            job_id = self.bot.twap_orders.start_twap_order(
+                symbol, side, formatted_total_quantity, duration, burst=burst
+            )
+            print(f"{_GREEN}TWAP order started successfully: {job_id}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}TWAP order error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}TWAP order error: {e}{_RESET}")
     
     def _handle_grid_strategy(self):
         symbol = self._get_input("Symbol: ")
@@ -372,9 +513,9 @@ class TradingCLI:
         try:
             current_price = self.bot.get_current_price(symbol)
             formatted_current_price = self._format_price(symbol, current_price)
-            print(f"{Fore.YELLOW}Current {symbol} price: {formatted_current_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Current {symbol} price: {formatted_current_price}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}Error getting current price: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Error getting current price: {e}{_RESET}")
             return
         
         lower_price = self._get_input("Lower price: ", float)
@@ -384,12 +525,12 @@ class TradingCLI:
         if not upper_price: return
         
         if lower_price >= upper_price:
-            print(f"{Fore.RED}Lower price must be less than upper price{Style.RESET_ALL}")
+            print(f"{_RED}Lower price must be less than upper price{_RESET}")
             return
         
         grid_count = self._get_input("Grid levels: ", int)
         if not grid_count or grid_count < 2: 
-            print(f"{Fore.RED}Grid levels must be at least 2{Style.RESET_ALL}")
+            print(f"{_RED}Grid levels must be at least 2{_RESET}")
             return
         
         total_quantity = self._get_input("Total quantity: ", float)
@@ -401,30 +542,29 @@ class TradingCLI:
         formatted_total_quantity = self._format_quantity(symbol, total_quantity)
         
         if any(v is None for v in [formatted_lower_price, formatted_upper_price, formatted_total_quantity]):
-            print(f"{Fore.RED}Error formatting parameters{Style.RESET_ALL}")
+            print(f"{_RED}Error formatting parameters{_RESET}")
             return
         
         # Show adjustments
         if formatted_lower_price != lower_price:
-            print(f"{Fore.YELLOW}Lower price adjusted to {formatted_lower_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Lower price adjusted to {formatted_lower_price}{_RESET}")
         if formatted_upper_price != upper_price:
-            print(f"{Fore.YELLOW}Upper price adjusted to {formatted_upper_price}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Upper price adjusted to {formatted_upper_price}{_RESET}")
         if formatted_total_quantity != total_quantity:
-            print(f"{Fore.YELLOW}Total quantity adjusted to {formatted_total_quantity}{Style.RESET_ALL}")
+            print(f"{_YELLOW}Total quantity adjusted to {formatted_total_quantity}{_RESET}")
         
         try:
             grid_id = self.bot.grid_orders.create_grid_strategy(
                 symbol, formatted_lower_price, formatted_upper_price, grid_count, formatted_total_quantity
             )
             self.bot.grid_orders.start_grid_strategy(grid_id)
-            print(f"{Fore.GREEN}Grid strategy started successfully: {grid_id}{Style.RESET_ALL}")
+            print(f"{_GREEN}Grid strategy started successfully: {grid_id}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}Grid strategy error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Grid strategy error: {e}{_RESET}")
     
     def _handle_balance(self):
         try:
             balances = self.bot.get_balance()
-            print(f"\n{Fore.BLUE}ACCOUNT BALANCES{Style.RESET_ALL}")
             
             # Filter out zero balances and prepare data for tabulate
             data = []
@@ -442,12 +582,12 @@ class TradingCLI:
             
             if data:
                 headers = ['Asset', 'Available', 'Wallet Balance']
-                print(tabulate(data, headers=headers, tablefmt='grid'))
+                self._print_table(data, headers, f"{_BLUE}ACCOUNT BALANCES{_RESET}", _BALANCE_ALIGN)
             else:
-                print(f"{Fore.YELLOW}No balances to display{Style.RESET_ALL}")
+                print(f"\n{_BLUE}ACCOUNT BALANCES{_RESET}\n{_YELLOW}No balances to display{_RESET}")
             
         except Exception as e:
-            print(f"{Fore.RED}Balance error: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Balance error: {e}{_RESET}")
     
     def _handle_price(self):
         symbol = self._get_input("Symbol: ")
@@ -457,22 +597,61 @@ class TradingCLI:
         if duration is None: return
         
         if duration < 0:
-            print(f"{Fore.RED}Duration cannot be negative{Style.RESET_ALL}")
+            print(f"{_RED}Duration cannot be negative{_RESET}")
             return
         
-        print(f"\n{Fore.YELLOW}Press Ctrl+C to stop monitoring{Style.RESET_ALL}")
+        print(f"\n{_YELLOW}Press Ctrl+C to stop monitoring{_RESET}")
+        
+        # Coalesce ticks into at most one terminal write per PRICE_REFRESH seconds
+        pending = None
+        last_write = 0.0
+        last_price = None
+        # Constant parts of the line built once; \x1b[K clears what a longer previous line left
+        label = f" | {symbol}: "
+        line_end = f"\x1b[K{_RESET}"
+        
+        def write_pending():
+            nonlocal pending, last_write
+            if pending:
+                sys.stdout.write(pending)
+                sys.stdout.flush()
+                pending = None
+                last_write = time.monotonic()
         
         def price_callback(symbol, price, timestamp):
-            formatted_price = self._format_price(symbol, price)
-            print(f"\r{Fore.BLUE}{timestamp} | {symbol}: {formatted_price}{Style.RESET_ALL}", end='')
+            nonlocal pending, last_price
+            # Streamed book updates often only change sizes; an unchanged price needs no new line
+            if price != last_price:
+                last_price = price
+                pending = f"\r{_BLUE}{timestamp}{label}{self._format_price(symbol, price)}{line_end}"
+            if pending and time.monotonic() - last_write >= PRICE_REFRESH:
+                write_pending()
+        
+        # Monitor on a worker so the main thread stays free to catch Ctrl+C promptly
+        stop_event = threading.Event()
+        errors = []
+        
+        def monitor():
+            try:
+                self.bot.monitor_price(symbol, duration, price_callback, stop_event)
+            except Exception as e:
+                errors.append(e)
         
+        worker = threading.Thread(target=monitor, daemon=True)
+        worker.start()
         try:
-            self.bot.monitor_price(symbol, duration, price_callback)
-            print()  # New line after monitoring ends
+            while worker.is_alive():
+                worker.join(timeout=0.2)
+            write_pending()
+            if errors:
+                print(f"\n{_RED}Price monitoring error: {errors[0]}{_RESET}")
+            else:
+                print()  # New line after monitoring ends
         except KeyboardInterrupt:
-            print(f"\n{Fore.YELLOW}Price monitoring stopped{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"\n{Fore.RED}Price monitoring error: {e}{Style.RESET_ALL}")
+            stop_event.set()
+            worker.join()
+            write_pending()
+            print(f"\n{_YELLOW}Price monitoring stopped{_RESET}")
     
     def _handle_order_history(self):
         try:
@@ -486,7 +665,7 @@ class TradingCLI:
             orders = self.bot.get_order_history(symbol=symbol if symbol else None, limit=limit)
 
             if not orders:
-                print(f"{Fore.YELLOW}No orders found in history{Style.RESET_ALL}")
+                print(f"{_YELLOW}No orders found in history{_RESET}")
                 return
 
             data = []
@@ -499,92 +678,101 @@ class TradingCLI:
                     f"{order.quantity:.6f}",
                     display_price,
                     getattr(order, 'status', 'Unknown'),
-                    order.timestamp.strftime('%Y-%m-%d %H:%M:%S') if hasattr(order, 'timestamp') else 'N/A',
+                    _fmt_ts(order.update_time // 1000) if order.update_time else 'N/A',
                     getattr(order, 'order_type', 'Unknown')
                 ])
 
             headers = ['Order ID', 'Symbol', 'Side', 'Quantity', 'Price', 'Status', 'Time', 'Type']
-            print(f"\n{Fore.BLUE}ORDER HISTORY{Style.RESET_ALL}")
-            print(tabulate(data, headers=headers, tablefmt='grid'))
+            self._print_table(data, headers, f"{_BLUE}ORDER HISTORY{_RESET}", _HISTORY_ALIGN)
 
             # Show summary if we have orders
             if data:
-                buy_orders = [order for order in orders if order.side == 'BUY']
-                sell_orders = [order for order in orders if order.side == 'SELL']
+                # Side counts and volume in one pass over the fetched orders
+                buy_count = sell_count = 0
+                total_volume = 0.0
+                for o in orders:
+                    if o.side == 'BUY':
+                        buy_count += 1
+                    elif o.side == 'SELL':
+                        sell_count += 1
+                    if getattr(o, 'price', None) and getattr(o, 'quantity', None):
+                        total_volume += o.quantity * o.price
 
-                print(f"\n{Fore.CYAN}Summary:{Style.RESET_ALL}")
-                print(f"Total Orders: {len(orders)}")
-                print(f"Buy Orders: {len(buy_orders)}")
-                print(f"Sell Orders: {len(sell_orders)}")
-
-                # Calculate total volume if prices are available
-                total_volume = sum((getattr(o, 'quantity', 0) * getattr(o, 'price', 0)) for o in orders if hasattr(o, 'price') and getattr(o, 'price', None))
+                summary = [
+                    f"\n{_CYAN}Summary:{_RESET}",
+                    f"Total Orders: {len(orders)}",
+                    f"Buy Orders: {buy_count}",
+                    f"Sell Orders: {sell_count}",
+                ]
                 if total_volume > 0:
-                    print(f"Total Volume: {total_volume:.4f}")
+                    summary.append(f"Total Volume: {total_volume:.4f}")
+                self._write_lines(summary)
 
         except Exception as e:
-            print(f"{Fore.RED}Error fetching order history: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Error fetching order history: {e}{_RESET}")
     
     def _handle_status(self):
-        print(f"\n{Fore.BLUE}TRADING STATUS{Style.RESET_ALL}")
+        # Every section is collected and emitted in a single write
+        lines = [f"\n{_BLUE}TRADING STATUS{_RESET}"]
         
         try:
             # Recent orders with actual prices
-            if self.bot.order_history:
-                recent_orders = self.bot.order_history[-5:]
-                print(f"\n{Fore.CYAN}Recent Orders:{Style.RESET_ALL}")
-                for order in recent_orders:
-                    price_str = f"{order.price:.4f}" if order.price else "Market"
-                    total_value = f"{(order.quantity * order.price):.4f}" if order.price else "N/A"
-                    print(f"  {order.symbol} {order.side} {order.quantity:.6f} @ {price_str} (Total: {total_value})")
+            history = self.bot.order_history
+            if history:
+                lines.append(f"\n{_CYAN}Session Orders: {len(history)} "
+                             f"(Buy: {history.buy_count}, Sell: {history.sell_count}, "
+                             f"Volume: {history.total_volume:.4f}){_RESET}")
+                lines.append(f"\n{_CYAN}Recent Orders:{_RESET}")
+                for order in history.recent(5):
+                    lines.append(_ORDER_FMT.format(
+                        symbol=order.symbol, side=order.side, quantity=order.quantity,
+                        price=f"{order.price:.4f}" if order.price else "Market",
+                        total=f"{(order.quantity * order.price):.4f}" if order.price else "N/A"
+                    ))
             else:
-                print(f"\n{Fore.YELLOW}No recent orders{Style.RESET_ALL}")
+                lines.append(f"\n{_YELLOW}No recent orders{_RESET}")
         
             # TWAP jobs
             try:
                 twap_jobs = self.bot.twap_orders.get_twap_jobs()
                 if twap_jobs:
-                    print(f"\n{Fore.CYAN}TWAP Jobs: {len(twap_jobs)}{Style.RESET_ALL}")
-                    for job_id, job in twap_jobs.items():
-                        avg_price = 0
-                        if job.get('orders'):
-                            total_cost = sum(o.quantity * o.price for o in job['orders'] if hasattr(o, 'price') and o.price)
-                            total_qty = sum(o.quantity for o in job['orders'] if hasattr(o, 'quantity'))
-                            avg_price = total_cost / total_qty if total_qty > 0 else 0
-                    
-                        print(f"  {job_id}: {job.get('status', 'Unknown')} ({job.get('completed', 0)}/{job.get('parts', 0)}) Avg: {avg_price:.4f}")
+                    lines.append(f"\n{_CYAN}TWAP Jobs: {len(twap_jobs)}{_RESET}")
+                    lines.extend(_TWAP_FMT.format_map(job) for job in twap_jobs.values())
             except Exception as e:
-                print(f"{Fore.RED}Error getting TWAP status: {e}{Style.RESET_ALL}")
+                lines.append(f"{_RED}Error getting TWAP status: {e}{_RESET}")
         
             # OCO orders
             try:
                 oco_orders = self.bot.oco_orders.get_oco_orders()
                 if oco_orders:
-                    print(f"\n{Fore.CYAN}OCO Orders: {len(oco_orders)}{Style.RESET_ALL}")
-                    for oco_id, oco in oco_orders.items():
-                        print(f"  {oco_id}: {oco.get('status', 'Unknown')}")
+                    lines.append(f"\n{_CYAN}OCO Orders: {len(oco_orders)}{_RESET}")
+                    lines.extend(_OCO_FMT.format_map(oco) for oco in oco_orders.values())
             except Exception as e:
-                print(f"{Fore.RED}Error getting OCO status: {e}{Style.RESET_ALL}")
+                lines.append(f"{_RED}Error getting OCO status: {e}{_RESET}")
         
             # Grid strategies  
             try:
                 grid_strategies = self.bot.grid_orders.get_grid_strategies()
                 if grid_strategies:
-                    print(f"\n{Fore.CYAN}Grid Strategies: {len(grid_strategies)}{Style.RESET_ALL}")
-                    for grid_id, grid in grid_strategies.items():
-                        print(f"  {grid_id}: {grid.get('status', 'Unknown')} (Trades: {grid.get('total_trades', 0)}, P&L: {grid.get('profit_loss', 0):.4f})")
+                    lines.append(f"\n{_CYAN}Grid Strategies: {len(grid_strategies)}{_RESET}")
+                    lines.extend(_GRID_FMT.format_map(grid) for grid in grid_strategies.values())
             except Exception as e:
-                print(f"{Fore.RED}Error getting Grid status: {e}{Style.RESET_ALL}")
+                lines.append(f"{_RED}Error getting Grid status: {e}{_RESET}")
                 
         except Exception as e:
-            print(f"{Fore.RED}Error getting status: {e}{Style.RESET_ALL}")
+            lines.append(f"{_RED}Error getting status: {e}{_RESET}")
+        
+        self._write_lines(lines)
 
     def _display_order_result(self, order):
         """Display order execution results"""
         try:
-            formatted_quantity = self._format_quantity(order.symbol, order.quantity)
-            formatted_price = self._format_price(order.symbol, order.price) if order.price else None
-            formatted_total = self._format_price(order.symbol, order.quantity * order.price) if order.price else None
+            # One symbol info lookup shared by every field
+            info = self._get_symbol_info(order.symbol) or {}
+            price_precision = info.get('price_precision', 8)
+            formatted_quantity = _round(float(order.quantity), info.get('quantity_precision', 8))
+            formatted_price = _round(float(order.price), price_precision) if order.price else None
+            formatted_total = _round(order.quantity * order.price, price_precision) if order.price else None
             
             order_data = [
                 ['Order ID', str(order.order_id)],
@@ -598,9 +786,8 @@ class TradingCLI:
                 ['Time', order.timestamp.strftime('%H:%M:%S') if hasattr(order, 'timestamp') else 'N/A']
             ]
             
-            print(f"\n{Fore.GREEN}ORDER EXECUTED{Style.RESET_ALL}")
-            print(tabulate(order_data, headers=['Field', 'Value'], tablefmt='grid'))
+            self._print_table(order_data, ['Field', 'Value'], f"{_GREEN}ORDER EXECUTED{_RESET}")
             
         except Exception as e:
-            print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
-            print(f"{Fore.GREEN}Order placed: {order.symbol} {order.side} {order.quantity}{Style.RESET_ALL}")
+            print(f"{_RED}Error: {e}{_RESET}")
+            print(f"{_GREEN}Order placed: {order.symbol} {order.side} {order.quantity}{_RESET}")
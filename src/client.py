@@ -0,0 +1,151 @@
+import hmac
+import time
+import asyncio
+import hashlib
+from typing import Dict, Tuple
+import aiohttp
+from requests.adapters import HTTPAdapter
+from binance import AsyncClient, Client
+from binance.client import BaseClient
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from .rate_limit import ENDPOINT_WEIGHTS, WeightLimiter, endpoint_weight
+
+try:
+    import orjson
+except ImportError:  # fall back to requests' stdlib json decoding
+    orjson = None
+
+BATCH_SIZE = 5  # most orders POST /fapi/v1/batchOrders accepts per request
+
+
+class TradingClient(Client):
+    """python-binance client that decodes REST responses with orjson when available
+    and paces futures requests through a WeightLimiter"""
+
+    def __init__(self, *args, pool_size: int = 10, limiter: WeightLimiter = None, **kwargs):
+        self._pool_size = pool_size
+        self.limiter = limiter or WeightLimiter()
+        # Client.__init__ would ping the spot API, a host this bot never trades on;
+        # warm the futures connection that every order call will reuse instead
+        BaseClient.__init__(self, *args, **kwargs)
+        # Key schedule done once; every signature hashes on a copy of this state
+        self._hmac = hmac.new(self.API_SECRET.encode('utf-8'), digestmod=hashlib.sha256) if self.API_SECRET else None
+        self.futures_ping()
+
+    def _init_session(self):
+        """Session whose keep-alive pool has a connection for each concurrent caller"""
+        session = super()._init_session()
+        # pool_block: a caller beyond pool_size waits for a warm connection rather than
+        # opening a throwaway one, paying a TCP+TLS handshake that urllib3 then discards
+        adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size, pool_block=True)
+        session.mount('https://', adapter)
+        return session
+
+    def _request_futures_api(self, method, path, signed=False, version: int = 1, **kwargs) -> Dict:
+        self.limiter.acquire(endpoint_weight(path, kwargs.get('data')))
+        return super()._request_futures_api(method, path, signed, version, **kwargs)
+
+    def _request(self, method, uri: str, signed: bool, force_params: bool = False, **kwargs):
+        # Client._request hands over self.response, which another thread may have replaced
+        kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
+        response = getattr(self.session, method)(uri, **kwargs)
+        self.response = response
+        return self._handle_response(response)
+
+    def _hmac_signature(self, query_string: str) -> str:
+        assert self._hmac, "API Secret required for private endpoints"
+        signer = self._hmac.copy()
+        signer.update(query_string.encode('utf-8'))
+        return signer.hexdigest()
+
+    def _handle_response(self, response):
+        # Resync with the server's count from this call's own response (self.response is
+        # shared by every thread), which also covers the stream managers' calls
+        self.limiter.reconcile(response.headers)
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        try:
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+        except ValueError:
+            raise BinanceRequestException('Invalid Response: %s' % response.text)
+
+    def order_template(self, fields: Tuple[str, ...], **static) -> 'OrderTemplate':
+        """Signed futures order endpoint with the given params fixed, e.g. symbol/side/type,
+        taking the values of fields, in that order, on each send"""
+        return OrderTemplate(self, fields, **static)
+
+
+class AsyncTradingClient(AsyncClient):
+    """AsyncClient decoding with orjson when available and drawing futures request
+    weight from the same WeightLimiter as TradingClient"""
+
+    def __init__(self, *args, limiter: WeightLimiter = None, **kwargs):
+        self.limiter = limiter or WeightLimiter()
+        super().__init__(*args, **kwargs)
+
+    async def _request_futures_api(self, method, path, signed=False, version=1, **kwargs) -> Dict:
+        await self.limiter.acquire_async(endpoint_weight(path, kwargs.get('data')))
+        return await super()._request_futures_api(method, path, signed, version, **kwargs)
+
+    async def _handle_response(self, response: aiohttp.ClientResponse):
+        # Concurrent coroutines share self.response, so only this call's response is trusted
+        self.limiter.reconcile(response.headers)
+        if not str(response.status).startswith('2'):
+            raise BinanceAPIException(response, response.status, await response.text())
+        try:
+            if orjson is not None:
+                return orjson.loads(await response.read())
+            return await response.json()
+        except ValueError:
+            raise BinanceRequestException('Invalid Response: %s' % await response.text())
+
+
+async def open_async_client(api_key: str, api_secret: str, testnet: bool = False,
+                            pool_size: int = 10, timeout: float = 5,
+                            limiter: WeightLimiter = None) -> AsyncClient:
+    """AsyncClient on the running loop, so monitors awaiting REST calls need no executor thread.
+
+    Built directly rather than through AsyncClient.create, which pings the spot API;
+    all of its requests share one keep-alive aiohttp session.
+    """
+    connector = aiohttp.TCPConnector(limit=pool_size, ttl_dns_cache=300)
+    return AsyncTradingClient(api_key, api_secret, testnet=testnet, loop=asyncio.get_running_loop(),
+                              session_params={'connector': connector, 'timeout': aiohttp.ClientTimeout(total=timeout)},
+                              limiter=limiter)
+
+
+class OrderTemplate:
+    """POST /fapi/v1/order with the invariant params pre-encoded and already fed to the HMAC.
+
+    Each send fills the per-order values and the timestamp into a tail format
+    fixed at construction (no kwargs dict or urlencode), and hashes just that
+    tail on a copy of the seeded HMAC state.
+    """
+
+    def __init__(self, client: TradingClient, fields: Tuple[str, ...], **static):
+        self._client = client
+        self._url = client._create_futures_api_uri('order')
+        self._prefix = ''.join(f"{k}={v}&" for k, v in static.items())
+        self._tail = ''.join(f"{name}={{}}&" for name in fields) + 'timestamp={}'
+        self._arity = len(fields)
+        self._hmac = client._hmac.copy()
+        self._hmac.update(self._prefix.encode('utf-8'))
+        # Same request options python-binance would apply
+        self._kwargs: Dict = {'timeout': client.REQUEST_TIMEOUT, **(client._requests_params or {})}
+
+    def send(self, *values: str) -> Dict:
+        """Place one order; values are the already-formatted strings for fields"""
+        if len(values) != self._arity:
+            raise TypeError(f"Expected {self._arity} order values, got {len(values)}")
+        client = self._client
+        tail = self._tail.format(*values, int(time.time() * 1000 + client.timestamp_offset))
+        signer = self._hmac.copy()
+        signer.update(tail.encode('utf-8'))
+        # Futures endpoints take their params in the query string (python-binance's force_params)
+        query = f"{self._prefix}{tail}&signature={signer.hexdigest()}"
+        client.limiter.acquire(ENDPOINT_WEIGHTS['order'])
+        response = client.session.post(f"{self._url}?{query}", **self._kwargs)
+        client.response = response
+        return client._handle_response(response)
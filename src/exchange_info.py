@@ -0,0 +1,113 @@
+import time
+import threading
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Optional
+
+DEFAULT_TTL = 300  # seconds; one exchangeInfo payload serves every handler in between
+
+
+def round_to_step(value: float, step: Decimal) -> str:
+    """value rounded to the nearest multiple of step, as the plain string sent to the exchange.
+
+    Honours ticks such as 0.25 or 10 that a decimal-places rounding would
+    miss, and keeps only the step's significant places ('0.010' -> 2).
+    """
+    return format((Decimal(str(value)) / step).to_integral_value() * step, 'f')
+
+
+def _step_places(step: Decimal) -> Optional[int]:
+    """Decimal places of a power-of-ten step ('0.01' -> 2), or None for steps like 0.25 or 10"""
+    _, digits, exponent = step.as_tuple()
+    return -exponent if digits == (1,) and exponent <= 0 else None
+
+
+def _round_at(value: float, step: Decimal, places: Optional[int]) -> str:
+    # Power-of-ten steps are a plain fixed-point format; only odd ticks need Decimal
+    return f"{value:.{places}f}" if places is not None else round_to_step(value, step)
+
+
+@lru_cache(maxsize=None)
+def _quantum(places: int) -> Decimal:
+    return Decimal(1).scaleb(-places)
+
+
+def decimal_str(value: float, places: int) -> str:
+    """value rounded to places decimals as the plain string sent to the exchange.
+
+    Rounds in decimal, so 29999.96 at 1 place is '30000.0' rather than a
+    binary-float artefact like 29999.999999999996.
+    """
+    return format(Decimal(str(value)).quantize(_quantum(places)), 'f')
+
+
+class ExchangeInfoCache:
+    """Futures exchange info fetched at most once per TTL and indexed by symbol"""
+
+    def __init__(self, client, ttl: float = DEFAULT_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, dict] = {}
+        self._filters: Dict[str, Dict[str, dict]] = {}
+        self._price_ticks: Dict[str, Decimal] = {}
+        self._quantity_steps: Dict[str, Decimal] = {}
+        self._price_places: Dict[str, Optional[int]] = {}
+        self._quantity_places: Dict[str, Optional[int]] = {}
+        self._expiry = 0.0
+
+    def symbols(self) -> Dict[str, dict]:
+        """Raw exchange info entry for every symbol, keyed by symbol"""
+        with self._lock:
+            if time.monotonic() >= self._expiry:
+                self._refresh()
+            return self._symbols
+
+    def get(self, symbol: str) -> Optional[dict]:
+        return self.symbols().get(symbol)
+
+    def filters(self, symbol: str) -> Dict[str, dict]:
+        """Symbol filters keyed by filterType (empty if the symbol is unknown)"""
+        self.symbols()
+        return self._filters.get(symbol, {})
+
+    def round_price(self, symbol: str, price: float) -> Optional[str]:
+        """price at the symbol's PRICE_FILTER tick size, or None if it has none"""
+        self.symbols()
+        tick = self._price_ticks.get(symbol)
+        return None if tick is None else _round_at(price, tick, self._price_places.get(symbol))
+
+    def quantity_step(self, symbol: str) -> Optional[Decimal]:
+        """The symbol's LOT_SIZE step size, or None if it has none"""
+        self.symbols()
+        return self._quantity_steps.get(symbol)
+
+    def round_quantity(self, symbol: str, quantity: float) -> Optional[str]:
+        """quantity at the symbol's LOT_SIZE step size, or None if it has none"""
+        self.symbols()
+        step = self._quantity_steps.get(symbol)
+        return None if step is None else _round_at(quantity, step, self._quantity_places.get(symbol))
+
+    def _refresh(self):
+        info = self.client.futures_exchange_info()
+        symbols = {}
+        filters = {}
+        price_ticks = {}
+        quantity_steps = {}
+        price_places = {}
+        quantity_places = {}
+        for s in info['symbols']:
+            symbol = s['symbol']
+            symbols[symbol] = s
+            filters[symbol] = by_type = {f['filterType']: f for f in s['filters']}
+            if 'PRICE_FILTER' in by_type:
+                price_ticks[symbol] = tick = Decimal(by_type['PRICE_FILTER']['tickSize']).normalize()
+                price_places[symbol] = _step_places(tick)
+            if 'LOT_SIZE' in by_type:
+                quantity_steps[symbol] = step = Decimal(by_type['LOT_SIZE']['stepSize']).normalize()
+                quantity_places[symbol] = _step_places(step)
+        # Swap whole dicts so readers never see a half-built index
+        self._symbols, self._filters = symbols, filters
+        self._price_ticks, self._quantity_steps = price_ticks, quantity_steps
+        self._price_places, self._quantity_places = price_places, quantity_places
+        self._expiry = time.monotonic() + self.ttl
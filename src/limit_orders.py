@@ -1,61 +1,97 @@
+import json
 import logging
-import time
-from datetime import datetime
-from .order_result import OrderResult
+from typing import Dict, List, Optional, Tuple
+from .client import BATCH_SIZE
+from .order_result import OrderResult, side_sign
+from .exchange_info import ExchangeInfoCache, decimal_str
+from .price_cache import PriceCache
+
+FILL_TIMEOUT = 0.5  # upper bound on waiting for a pushed fill before asking the exchange
+
+
+def _fills_immediately(sign: int, price: float, current_price: float) -> bool:
+    """A limit order crosses the book if it bids at/above or offers at/below the market"""
+    return sign * (price - current_price) >= 0
+
+
+def _stop_triggers_immediately(sign: int, stop_price: float, current_price: float) -> bool:
+    """A stop must sit above the market for BUY and below it for SELL"""
+    return sign * (stop_price - current_price) <= 0
 
 
 class LimitOrderHandler:
-    def __init__(self, client):
+    def __init__(self, client, exchange_info: ExchangeInfoCache = None, user_stream=None,
+                 prices: PriceCache = None):
         self.client = client
+        self.exchange_info = exchange_info or ExchangeInfoCache(client)
+        self.prices = prices or PriceCache(client)
+        self.user_stream = user_stream
         self.logger = logging.getLogger("LimitOrder")
-        self._price_precision_cache = {}
+        self._templates = {}  # (symbol, side[, 'STOP']) -> signed LIMIT/STOP order template
     
-    def _get_symbol_price_precision(self, symbol: str) -> int:
-        if symbol not in self._price_precision_cache:
-            try:
-                info = self.client.futures_exchange_info()
-                for s in info['symbols']:
-                    if s['symbol'] == symbol:
-                        self._price_precision_cache[symbol] = len(s['filters'][0]['tickSize'].rstrip('0').split('.')[1])
-                        break
-            except Exception as e:
-                self.logger.warning(f"Could not get price precision for {symbol}: {e}")
-                return 1  # Default to 1 decimal place if we can't get the info
-        return self._price_precision_cache[symbol]
+    def _format_price(self, symbol: str, price: float) -> str:
+        """Format price according to symbol's tick size, as the string sent to the exchange"""
+        try:
+            rounded = self.exchange_info.round_price(symbol, price)
+        except Exception as e:
+            self.logger.warning(f"Could not get price precision for {symbol}: {e}")
+            rounded = None
+        if rounded is None:
+            return decimal_str(price, 1)  # Default to 1 decimal place if we can't get the info
+        return rounded
     
-    def _format_price(self, symbol: str, price: float) -> float:
-        """Format price according to symbol's precision requirements"""
-        precision = self._get_symbol_price_precision(symbol)
-        return round(price, precision)
+    def _format_quantity(self, symbol: str, quantity: float) -> str:
+        """Quantity at the symbol's LOT_SIZE step size, as the string sent to the exchange"""
+        try:
+            rounded = self.exchange_info.round_quantity(symbol, quantity)
+        except Exception as e:
+            self.logger.warning(f"Could not get quantity step for {symbol}: {e}")
+            rounded = None
+        return str(quantity) if rounded is None else rounded
+
+    def _limit_template(self, symbol: str, side: str):
+        """Reuse one pre-signed template per symbol/side; grid bursts only vary qty and price"""
+        template = self._templates.get((symbol, side))
+        if template is None:
+            template = self._templates[(symbol, side)] = self.client.order_template(
+                ('quantity', 'price'), symbol=symbol, side=side, type='LIMIT', timeInForce='GTC'
+            )
+        return template
+
+    def _stop_template(self, symbol: str, side: str):
+        """Pre-signed STOP (stop-limit) template per symbol/side, as used by every OCO"""
+        template = self._templates.get((symbol, side, 'STOP'))
+        if template is None:
+            template = self._templates[(symbol, side, 'STOP')] = self.client.order_template(
+                ('quantity', 'price', 'stopPrice'), symbol=symbol, side=side, type='STOP', timeInForce='GTC'
+            )
+        return template
 
     def place_order(self, symbol: str, side: str, quantity: float, price: float) -> OrderResult:
         try:
+            side = side.upper()  # normalised once; checks below use its numeric sign
+            sign = side_sign(side)
             current_price = self._get_current_price(symbol)
-            formatted_price = self._format_price(symbol, price)
-            self._log_execution_prediction(side, formatted_price, current_price)
+            # Decimal strings go on the wire; their floats serve the checks and the result
+            qty_str = self._format_quantity(symbol, quantity)
+            price_str = self._format_price(symbol, price)
+            formatted_price = float(price_str)
+            self._log_execution_prediction(sign, formatted_price, current_price)
             
-            self.logger.info(f"Placing LIMIT order: {side} {quantity} {symbol} @ {formatted_price}")
+            self.logger.info("Placing LIMIT order: %s %s %s @ %s", side, qty_str, symbol, price_str)
             
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side.upper(),
-                type='LIMIT',
-                timeInForce='GTC',
-                quantity=str(quantity),
-                price=str(formatted_price)
-            )
+            order = self._limit_template(symbol, side).send(qty_str, price_str)
             
             # Get actual execution price for immediate fills
-            actual_price = self._get_execution_price(symbol, order, formatted_price, side, current_price)
+            actual_price = self._get_execution_price(symbol, order, formatted_price, sign, current_price)
             
             return OrderResult(
                 order_id=order['orderId'],
                 symbol=order['symbol'],
                 side=order['side'],
-                quantity=float(order['origQty']),
+                quantity=float(qty_str),
                 price=actual_price,
                 status=order['status'],
-                timestamp=datetime.now(),
                 order_type='LIMIT'
             )
             
@@ -63,32 +99,76 @@ class LimitOrderHandler:
             self.logger.error(f"Limit order error: {e}")
             raise
     
+    def place_batch(self, specs: List[Dict]) -> List[Optional[OrderResult]]:
+        """
+        Place up to BATCH_SIZE GTC limit orders in one signed request.
+        specs are dicts with symbol, side, quantity and price; the result list
+        matches them in order, with None where the exchange rejected an order.
+        """
+        if len(specs) > BATCH_SIZE:
+            raise ValueError(f"At most {BATCH_SIZE} orders per batch, got {len(specs)}")
+        
+        batch = [
+            {
+                'symbol': spec['symbol'],
+                'side': spec['side'].upper(),
+                'type': 'LIMIT',
+                'timeInForce': 'GTC',
+                'quantity': self._format_quantity(spec['symbol'], spec['quantity']),
+                'price': self._format_price(spec['symbol'], spec['price'])
+            }
+            for spec in specs
+        ]
+        self.logger.info("Placing %d LIMIT orders in one batch", len(batch))
+        
+        try:
+            orders = self.client.futures_place_batch_order(
+                batchOrders=json.dumps(batch, separators=(',', ':'))
+            )
+        except Exception as e:
+            self.logger.error(f"Batch order error: {e}")
+            raise
+        
+        # Each entry is either the created order or its own {code, msg} error
+        results = []
+        for spec, order in zip(batch, orders):
+            if 'orderId' not in order:
+                self.logger.error("Batch order rejected: %s %s %s @ %s: %s", spec['side'], spec['quantity'],
+                                  spec['symbol'], spec['price'], order.get('msg'))
+                results.append(None)
+                continue
+            results.append(OrderResult(
+                order_id=order['orderId'],
+                symbol=order['symbol'],
+                side=order['side'],
+                quantity=float(spec['quantity']),
+                price=float(spec['price']),
+                status=order['status'],
+                order_type='LIMIT'
+            ))
+        return results
+    
     def place_stop_limit_order(self, symbol: str, side: str, quantity: float, 
                               price: float, stop_price: float) -> OrderResult:
         try:
+            side = side.upper()
             current_price = self._get_current_price(symbol)
-            self._validate_stop_price(side, stop_price, current_price)
+            self._validate_stop_price(side_sign(side), stop_price, current_price)
+            qty_str = self._format_quantity(symbol, quantity)
+            price_str = self._format_price(symbol, price)
+            stop_str = self._format_price(symbol, stop_price)
             
-            self.logger.info(f"Placing STOP-LIMIT: {side} {quantity} {symbol} @ {price} (stop: {stop_price})")
+            self.logger.info("Placing STOP-LIMIT: %s %s %s @ %s (stop: %s)", side, qty_str, symbol, price_str, stop_str)
             
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side.upper(),
-                type='STOP',
-                timeInForce='GTC',
-                quantity=str(quantity),
-                price=str(price),
-                stopPrice=str(stop_price)
-            )
+            order = self._stop_template(symbol, side).send(qty_str, price_str, stop_str)
             
             return OrderResult(
                 order_id=order['orderId'],
                 symbol=order['symbol'],
                 side=order['side'],
-                quantity=float(order['origQty']),
-                price=float(order['price']),
+                quantity=float(qty_str),
+                price=float(price_str),
                 status=order['status'],
-                timestamp=datetime.now(),
                 order_type='STOP_LIMIT'
             )
             
@@ -106,59 +186,56 @@ class LimitOrderHandler:
             return False
     
     def _get_current_price(self, symbol: str) -> float:
-        ticker = self.client.futures_symbol_ticker(symbol=symbol)
-        return float(ticker['price'])
+        return self.prices.get(symbol)
     
-    def _get_execution_price(self, symbol: str, order: dict, limit_price: float, side: str, current_price: float) -> float:
+    def _get_execution_price(self, symbol: str, order: dict, limit_price: float, sign: int, current_price: float) -> float:
         """Get actual execution price for limit orders"""
         try:
             # Check if order executed immediately
-            if self._will_execute_immediately(side, limit_price, current_price):
-                # Wait briefly for execution
-                time.sleep(0.5)
-                
-                # Get order details to see actual fill price
-                order_details = self.client.futures_get_order(symbol=symbol, orderId=order['orderId'])
-                
-                if order_details.get('status') == 'FILLED':
-                    avg_price = float(order_details.get('avgPrice', 0))
-                    if avg_price > 0:
-                        self.logger.info(f"Order filled at actual price: {avg_price}")
-                        return avg_price
+            if _fills_immediately(sign, limit_price, current_price):
+                status, avg_price = self._await_fill(order['orderId'], symbol)
+                if status == 'FILLED' and avg_price > 0:
+                    self.logger.info("Order filled at actual price: %s", avg_price)
+                    return avg_price
             
             # Return original limit price if not immediately filled
-            return float(order['price'])
+            return limit_price
             
         except Exception as e:
             self.logger.warning(f"Could not get execution price: {e}")
-            return float(order['price'])
+            return limit_price
     
-    def _will_execute_immediately(self, side: str, price: float, current_price: float) -> bool:
-        """Check if limit order will execute immediately"""
-        side = side.upper()
-        if side == 'BUY':
-            return price >= current_price
-        else:
-            return price <= current_price
+    def _await_fill(self, order_id: int, symbol: str, timeout: float = FILL_TIMEOUT) -> Tuple[Optional[str], float]:
+        """
+        (status, average price) of an order expected to match on arrival.
+        Takes the pushed update from the user data stream when it is up, otherwise
+        asks the exchange once: a crossing order has already been matched by the
+        time the query lands, so there is no fixed wait beforehand.
+        """
+        if self.user_stream and self.user_stream.active:
+            update = self.user_stream.wait_for_final(order_id, timeout)
+            if update:
+                return update['X'], float(update['ap'])
+        
+        order_details = self.client.futures_get_order(symbol=symbol, orderId=order_id)
+        return order_details.get('status'), float(order_details.get('avgPrice', 0))
     
-    def _log_execution_prediction(self, side: str, price: float, current_price: float):
-        side = side.upper()
+    def _log_execution_prediction(self, sign: int, price: float, current_price: float):
+        immediate = _fills_immediately(sign, price, current_price)
         
-        if side == 'BUY':
-            if price >= current_price:
-                self.logger.warning(f"BUY @ {price} >= current {current_price} - IMMEDIATE EXECUTION")
+        if sign > 0:
+            if immediate:
+                self.logger.warning("BUY @ %s >= current %s - IMMEDIATE EXECUTION", price, current_price)
             else:
-                self.logger.info(f"BUY @ {price} < current {current_price} - WAITING for price drop")
+                self.logger.info("BUY @ %s < current %s - WAITING for price drop", price, current_price)
         else:
-            if price <= current_price:
-                self.logger.warning(f"SELL @ {price} <= current {current_price} - IMMEDIATE EXECUTION")
+            if immediate:
+                self.logger.warning("SELL @ %s <= current %s - IMMEDIATE EXECUTION", price, current_price)
             else:
-                self.logger.info(f"SELL @ {price} > current {current_price} - WAITING for price rise")
+                self.logger.info("SELL @ %s > current %s - WAITING for price rise", price, current_price)
     
-    def _validate_stop_price(self, side: str, stop_price: float, current_price: float):
-        side = side.upper()
-        
-        if side == 'BUY' and stop_price <= current_price:
-            raise ValueError(f"BUY stop price ({stop_price}) must be > current price ({current_price})")
-        elif side == 'SELL' and stop_price >= current_price:
+    def _validate_stop_price(self, sign: int, stop_price: float, current_price: float):
+        if _stop_triggers_immediately(sign, stop_price, current_price):
+            if sign > 0:
+                raise ValueError(f"BUY stop price ({stop_price}) must be > current price ({current_price})")
             raise ValueError(f"SELL stop price ({stop_price}) must be < current price ({current_price})")
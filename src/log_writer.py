@@ -0,0 +1,39 @@
+from logging.handlers import QueueListener, RotatingFileHandler
+
+
+class DeferredFlushMixin:
+    """Leaves records in the file buffer until drain() is called.
+
+    StreamHandler flushes after every record, which costs one write syscall
+    per log line; behind a DrainingQueueListener a burst is written once.
+    """
+
+    def flush(self):
+        pass  # deferred to drain(); close() and rollover still flush the underlying file
+
+    def drain(self):
+        with self.lock:
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+
+
+class BufferedRotatingFileHandler(DeferredFlushMixin, RotatingFileHandler):
+    """RotatingFileHandler that only flushes on drain()"""
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener that drains buffered handlers whenever the queue runs empty"""
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            self._drain()
+
+    def stop(self):
+        super().stop()
+        self._drain()
+
+    def _drain(self):
+        for handler in self.handlers:
+            if isinstance(handler, DeferredFlushMixin):
+                handler.drain()
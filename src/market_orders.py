@@ -1,68 +1,149 @@
+import json
 import logging
-import time
-from datetime import datetime
-from .order_result import OrderResult
+from typing import List, Optional, Tuple
+from .client import BATCH_SIZE
+from .order_result import OrderResult, side_sign
+from .exchange_info import ExchangeInfoCache
+from .price_cache import PriceCache
+
+FILL_TIMEOUT = 2.0  # seconds to wait for a pushed fill before polling the order
+
+def _pct_change(initial: float, execution: float, sign: int) -> float:
+    """Execution slippage in percent; for SELL orders a positive change means price went down"""
+    return sign * (execution - initial) / initial * 100
 
 class MarketOrderHandler:
-    def __init__(self, client):
+    def __init__(self, client, user_stream=None, prices: PriceCache = None,
+                 exchange_info: ExchangeInfoCache = None):
         self.client = client
+        self.exchange_info = exchange_info or ExchangeInfoCache(client)
+        self.prices = prices or PriceCache(client)
+        self.user_stream = user_stream
         self.logger = logging.getLogger("MarketOrder")
         self._initial_price = 0
+        self._templates = {}  # (symbol, side) -> signed MARKET order template
     
     def _get_current_price(self, symbol: str) -> float:
-        ticker = self.client.futures_symbol_ticker(symbol=symbol)
-        return float(ticker['price'])
+        return self.prices.get(symbol)
+
+    def _format_quantity(self, symbol: str, quantity: float) -> str:
+        """Quantity at the symbol's LOT_SIZE step size, as the string sent to the exchange"""
+        try:
+            rounded = self.exchange_info.round_quantity(symbol, quantity)
+        except Exception as e:
+            self.logger.warning(f"Could not get quantity step for {symbol}: {e}")
+            rounded = None
+        return str(quantity) if rounded is None else rounded
+
+    def _market_template(self, symbol: str, side: str):
+        """Reuse one pre-signed template per symbol/side; TWAP slices only vary the quantity"""
+        template = self._templates.get((symbol, side))
+        if template is None:
+            template = self._templates[(symbol, side)] = self.client.order_template(
+                ('quantity',), symbol=symbol, side=side, type='MARKET'
+            )
+        return template
 
     def place_order(self, symbol: str, side: str, quantity: float) -> OrderResult:
         try:
+            side = side.upper()
+            sign = side_sign(side)
             # Get initial price before order execution
             self._initial_price = self._get_current_price(symbol)
             
-            self.logger.info(f"Placing MARKET order: {side} {quantity} {symbol}")
+            qty_str = self._format_quantity(symbol, quantity)
+            
+            self.logger.info("Placing MARKET order: %s %s %s", side, qty_str, symbol)
         
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side.upper(),
-                type='MARKET',
-                quantity=str(quantity)
-            )
+            order = self._market_template(symbol, side).send(qty_str)
         
-            # Wait briefly for order to be processed
-            time.sleep(0.5)
-            
-            # Fetch the complete order details to get accurate status and price
-            order_details = self.client.futures_get_order(
-                symbol=symbol,
-                orderId=order['orderId']
-            )
-            
-            execution_price = float(order_details.get('avgPrice', 0))
-            if execution_price == 0:
-                execution_price = float(order_details.get('price', 0))
-            
-            self.logger.info(f"Market order executed at price: {execution_price}")
-
-            # Validate prices and calculate price change
-            if self._initial_price > 0 and execution_price > 0:
-                # For SELL orders, positive change means price went down
-                multiplier = -1 if side.upper() == 'SELL' else 1
-                price_change = multiplier * ((execution_price - self._initial_price) / self._initial_price) * 100
-                self.logger.info(f"Price change from {self._initial_price} to {execution_price}: {price_change:.2f}%")
-            else:
-                self.logger.warning("Could not calculate price change - invalid prices")
+            execution_price, status = self._resolve_fill(symbol, order['orderId'])
+            self._log_price_change(sign, execution_price)
             
             return OrderResult(
-                order_id=order_details['orderId'],
-                symbol=order_details['symbol'],
-                side=order_details['side'],
-                quantity=float(order_details['origQty']),
+                order_id=order['orderId'],
+                symbol=order['symbol'],
+                side=order['side'],
+                quantity=float(qty_str),
                 price=execution_price,
-                status=order_details['status'],
-                timestamp=datetime.now(),
+                status=status,
                 order_type='MARKET'
             )
         
         except Exception as e:
             self.logger.error(f"Market order error: {e}")
             raise
-
+    
+    def place_batch(self, symbol: str, side: str, quantities: List[float]) -> List[Optional[OrderResult]]:
+        """
+        Place up to BATCH_SIZE market orders for one symbol/side in one signed request.
+        The result list matches quantities, with None where the exchange rejected an order.
+        """
+        if len(quantities) > BATCH_SIZE:
+            raise ValueError(f"At most {BATCH_SIZE} orders per batch, got {len(quantities)}")
+        try:
+            side = side.upper()
+            sign = side_sign(side)
+            self._initial_price = self._get_current_price(symbol)
+            qty_strs = [self._format_quantity(symbol, quantity) for quantity in quantities]
+            
+            self.logger.info("Placing %d MARKET orders in one batch: %s %s %s", len(qty_strs), side, qty_strs, symbol)
+            
+            orders = self.client.futures_place_batch_order(batchOrders=json.dumps(
+                [{'symbol': symbol, 'side': side, 'type': 'MARKET', 'quantity': q} for q in qty_strs],
+                separators=(',', ':')
+            ))
+        except Exception as e:
+            self.logger.error(f"Batch market order error: {e}")
+            raise
+        
+        # Each entry is either the created order or its own {code, msg} error
+        results = []
+        for qty_str, order in zip(qty_strs, orders):
+            if 'orderId' not in order:
+                self.logger.error("Batch market order rejected: %s %s %s: %s", side, qty_str, symbol, order.get('msg'))
+                results.append(None)
+                continue
+            execution_price, status = self._resolve_fill(symbol, order['orderId'])
+            self._log_price_change(sign, execution_price)
+            results.append(OrderResult(
+                order_id=order['orderId'],
+                symbol=order['symbol'],
+                side=order['side'],
+                quantity=float(qty_str),
+                price=execution_price,
+                status=status,
+                order_type='MARKET'
+            ))
+        return results
+    
+    def _resolve_fill(self, symbol: str, order_id: int) -> Tuple[float, str]:
+        """(execution price, status) of a just-placed market order"""
+        # The fill is pushed by the user data stream; no fixed wait or extra GET
+        streamed = self.user_stream and self.user_stream.active
+        update = self.user_stream.wait_for_final(order_id, FILL_TIMEOUT) if streamed else None
+        
+        if update and update['X'] == 'FILLED':
+            execution_price = float(update['ap'])
+            status = update['X']
+        else:
+            # Market orders match on arrival, so the order can be queried without a fixed wait
+            order_details = self.client.futures_get_order(
+                symbol=symbol,
+                orderId=order_id
+            )
+            execution_price = float(order_details.get('avgPrice', 0))
+            if execution_price == 0:
+                execution_price = float(order_details.get('price', 0))
+            status = order_details['status']
+        
+        self.logger.info("Market order executed at price: %s", execution_price)
+        return execution_price, status
+    
+    def _log_price_change(self, sign: int, execution_price: float):
+        # Validate prices and calculate price change
+        if self._initial_price > 0 and execution_price > 0:
+            price_change = _pct_change(self._initial_price, execution_price, sign)
+            self.logger.info("Price change from %s to %s: %.2f%%", self._initial_price, execution_price, price_change)
+        else:
+            self.logger.warning("Could not calculate price change - invalid prices")
@@ -0,0 +1,62 @@
+import json
+import logging
+import itertools
+from collections import deque
+from dataclasses import fields
+from typing import Iterator, List
+from .order_result import OrderResult
+
+HISTORY_FILE = 'order_history.jsonl'
+# OrderResult holds only scalars, so a record is built field by field instead of via asdict's deep copy
+_FIELDS = tuple(f.name for f in fields(OrderResult))
+
+
+class OrderHistory:
+    """Session orders: appended to a JSONL file, with only the most recent kept in memory.
+
+    Side counts and traded volume cover every order of the session, not just
+    the in-memory window.
+    """
+
+    def __init__(self, path: str = HISTORY_FILE, maxlen: int = 1000):
+        self.logger = logging.getLogger("OrderHistory")
+        self.path = path
+        self._recent = deque(maxlen=maxlen)
+        self._file = None
+        self.count = 0
+        self.buy_count = 0
+        self.sell_count = 0
+        self.total_volume = 0.0
+
+    def append(self, order: OrderResult):
+        self._persist(order)
+        self._recent.append(order)
+        self.count += 1
+        if order.side == 'BUY':
+            self.buy_count += 1
+        elif order.side == 'SELL':
+            self.sell_count += 1
+        if order.price:
+            self.total_volume += order.quantity * order.price
+
+    def recent(self, n: int) -> List[OrderResult]:
+        """Last n orders, oldest first"""
+        # Walk in from the newest end: O(n), not O(len) like a forward islice to the tail
+        latest = list(itertools.islice(reversed(self._recent), n))
+        latest.reverse()
+        return latest
+
+    def _persist(self, order: OrderResult):
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'a')
+            self._file.write(json.dumps({name: getattr(order, name) for name in _FIELDS}) + '\n')
+            self._file.flush()
+        except OSError as e:
+            self.logger.warning("Could not persist order %s: %s", order.order_id, e)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[OrderResult]:
+        return iter(self._recent)
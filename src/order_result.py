@@ -1,8 +1,21 @@
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+# +1 for BUY, -1 for SELL: lets price checks be written once for both sides
+SIDE_SIGN = {'BUY': 1, 'SELL': -1}
+
+def side_sign(side: str) -> int:
+    try:
+        return SIDE_SIGN[side]
+    except KeyError:
+        raise ValueError(f"Invalid side {side!r}: must be BUY or SELL") from None
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+@dataclass(slots=True, frozen=True)
 class OrderResult:
     order_id: int
     symbol: str
@@ -10,5 +23,10 @@ class OrderResult:
     quantity: float
     price: Optional[float]
     status: str
-    timestamp: datetime
     order_type: str
+    # Epoch milliseconds; stamped for free at construction, converted only when displayed
+    timestamp_ms: int = field(default_factory=_now_ms)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ms / 1000)
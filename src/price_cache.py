@@ -0,0 +1,44 @@
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+DEFAULT_TTL = 0.1  # seconds; collapses the ticker calls of one order, or one grid/TWAP burst
+
+
+class PriceCache:
+    """Last ticker price per symbol, refetched once it is older than the allowed age.
+
+    Concurrent misses on one symbol share a single ticker request: the first
+    caller fetches under the symbol's lock, the rest wait and reuse its price.
+    """
+
+    def __init__(self, client, ttl: float = DEFAULT_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._prices: Dict[str, Tuple[float, float]] = {}  # symbol -> (fetched_at, price)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> float:
+        """Ticker price for symbol, no older than max_age seconds (the cache TTL by default)"""
+        max_age = self.ttl if max_age is None else max_age
+        cached = self._prices.get(symbol)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        with self._symbol_lock(symbol):
+            # Another caller may have fetched it while this one waited
+            cached = self._prices.get(symbol)
+            if cached and time.monotonic() - cached[0] < max_age:
+                return cached[1]
+            price = float(self.client.futures_symbol_ticker(symbol=symbol)['price'])
+            # A single tuple store, so lock-free readers never see a torn entry
+            self._prices[symbol] = (time.monotonic(), price)
+            return price
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        lock = self._locks.get(symbol)
+        if lock is None:
+            with self._locks_lock:
+                lock = self._locks.setdefault(symbol, threading.Lock())
+        return lock
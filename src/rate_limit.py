@@ -0,0 +1,80 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+# Futures REQUEST_WEIGHT limit per IP, as reported in exchangeInfo rateLimits
+REQUEST_WEIGHT_PER_MINUTE = 2400
+
+# Documented request weights for the futures endpoints this bot calls; anything else costs 1
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+    'account': 5,
+    'balance': 5,
+    'allOrders': 5,
+    'batchOrders': 5,
+    'exchangeInfo': 1,
+    'listenKey': 1,
+    'openOrders': 1,
+    'order': 1,
+    'ping': 1,
+    'ticker/price': 1,
+}
+# Endpoints that cost more when called without a symbol
+UNSCOPED_WEIGHTS: Dict[str, int] = {
+    'openOrders': 40,
+    'ticker/price': 2,
+}
+
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+
+
+def endpoint_weight(path: str, params: Optional[dict] = None) -> int:
+    if not (params and 'symbol' in params) and path in UNSCOPED_WEIGHTS:
+        return UNSCOPED_WEIGHTS[path]
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+class WeightLimiter:
+    """Token bucket over the per-IP request weight, shared by every client of one account.
+
+    Tokens refill continuously at capacity/minute. A caller takes its weight up
+    front and sleeps off any deficit, so concurrent callers queue behind each
+    other instead of all firing into a -1003 ban.
+    """
+
+    def __init__(self, capacity: int = REQUEST_WEIGHT_PER_MINUTE, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, weight: int) -> float:
+        """Take weight tokens and return how long to wait before using them"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= weight
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, weight: int = 1):
+        delay = self._reserve(weight)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, weight: int = 1):
+        delay = self._reserve(weight)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def reconcile(self, headers):
+        """Lower the bucket to what the server says is left this minute; never raises it"""
+        used = headers.get(USED_WEIGHT_HEADER) if headers is not None else None
+        if used is None:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, self.capacity - int(used))
@@ -0,0 +1,39 @@
+import os
+import json
+import time
+import shutil
+from typing import Optional
+
+CACHE_DIR = os.path.join('.cache', 'symbol_info')
+DEFAULT_TTL = 24 * 60 * 60  # exchange filters rarely change; refresh daily
+
+
+def _path(symbol: str) -> str:
+    return os.path.join(CACHE_DIR, f"{symbol}.json")
+
+
+def load(symbol: str, ttl: float = DEFAULT_TTL) -> Optional[dict]:
+    """Return cached symbol info if present and younger than ttl seconds"""
+    path = _path(symbol)
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store(symbol: str, info: dict):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = _path(symbol) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(info, f)
+        os.replace(tmp, _path(symbol))
+    except OSError:
+        pass  # the disk cache is best-effort
+
+
+def clear():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
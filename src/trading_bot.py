@@ -1,23 +1,91 @@
 import os
 import sys
+import heapq
+import queue
+import atexit
+import asyncio
+import threading
 import logging
-from binance import Client
+from logging.handlers import QueueHandler
 from dotenv import load_dotenv
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from .client import TradingClient, open_async_client
+from .rate_limit import WeightLimiter
+from .log_writer import BufferedRotatingFileHandler, DrainingQueueListener
+from .user_stream import UserDataStream
+from .order_history import OrderHistory
+from .exchange_info import ExchangeInfoCache
+from .price_cache import PriceCache
 from .market_orders import MarketOrderHandler
 from .limit_orders import LimitOrderHandler
 from .advanced.oco import OCOOrderHandler
 from .advanced.twap import TWAPOrderHandler
 from .advanced.grid import GridOrderHandler
+from .advanced.scheduler import schedule, on_loop_thread, rest_method
 
 load_dotenv()
 
+# Monitor pool size; the HTTP connection pool is sized to match so workers reuse connections
+POOL_SIZE = 32
+# Concurrent allOrders requests when scanning symbols for order history
+HISTORY_CONCURRENCY = 5
+# bot.log rotates to bot.log.1 .. bot.log.5 at 64 MiB
+LOG_MAX_BYTES = 64 << 20
+LOG_BACKUPS = 5
+# Seconds monitor_price waits for a book ticker update before polling instead
+BOOK_TICKER_TIMEOUT = 5
+
+
+@lru_cache(maxsize=2)
+def _clock(sec: int) -> str:
+    # Price ticks arrive several times a second; format each wall-clock second once
+    return datetime.fromtimestamp(sec).strftime('%H:%M:%S')
+
+class HistoryOrder(NamedTuple):
+    order_id: Optional[int]
+    symbol: str
+    side: str
+    quantity: Optional[float]
+    price: Optional[float]
+    status: str
+    update_time: Optional[int]  # epoch ms, as sent by the exchange
+    order_type: str
+    # Additional futures-specific fields
+    position_side: str
+    reduce_only: bool
+    close_position: bool
+    
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.update_time / 1000) if self.update_time else None
+
+def _parse_order(o: dict) -> HistoryOrder:
+    """Convert a raw allOrders entry, treating '0' price/quantity as absent"""
+    price_val = o.get('price', '0')
+    qty_val = o.get('origQty', '0')
+    return HistoryOrder(
+        order_id=o.get('orderId'),
+        symbol=o.get('symbol', 'Unknown'),
+        side=o.get('side', 'Unknown'),
+        quantity=float(qty_val) if qty_val and qty_val != '0' else None,
+        price=float(price_val) if price_val and price_val != '0' else None,
+        status=o.get('status', 'Unknown'),
+        update_time=o.get('updateTime'),
+        order_type=o.get('type', 'Unknown'),
+        position_side=o.get('positionSide', 'BOTH'),
+        reduce_only=o.get('reduceOnly', False),
+        close_position=o.get('closePosition', False)
+    )
+
 class TradingBot:
     def get_order_history(self, symbol=None, limit=10):
         """
         Fetch order history from Binance Futures API.
-        Returns a list of order objects (dicts).
+        Returns a list of HistoryOrder records, most recent first.
         """
         try:
             if symbol:
@@ -29,64 +97,69 @@ class TradingBot:
                     return []
                 orders = self.client.futures_get_all_orders(symbol=symbol, limit=limit)
             else:
-                # Get futures exchange info instead of spot
-                exchange_info = self.client.futures_exchange_info()
                 # Filter for active USDT perpetual contracts
                 symbols = [
-                    s['symbol'] for s in exchange_info['symbols'] 
+                    s['symbol'] for s in self.exchange_info.symbols().values()
                     if (s['quoteAsset'] == 'USDT' and 
                         s['status'] == 'TRADING' and
                         s['contractType'] == 'PERPETUAL')
                 ]
-                orders = []
-                processed_symbols = 0
                 max_symbols = 10  # Limit to prevent rate limiting
-                for sym in symbols[:max_symbols]:
-                    try:
-                        sym_orders = self.client.futures_get_all_orders(
-                            symbol=sym, 
-                            limit=min(limit, 100)  # Limit per symbol
-                        )
-                        orders.extend(sym_orders)
-                        processed_symbols += 1
-                        # Add small delay to avoid rate limiting
-                        time.sleep(0.1)
-                    except Exception as e:
-                        self.logger.warning(f"Skipping symbol {sym}: {e}")
-                        continue
-                self.logger.info(f"Processed {processed_symbols} symbols")
-            # Sort by update time and limit results
-            orders = sorted(orders, key=lambda o: o.get('updateTime', 0), reverse=True)
-            orders = orders[:limit]
-            class OrderObj:
-                def __init__(self, d):
-                    for k, v in d.items():
-                        setattr(self, k, v)
-                    # Safe attribute access with proper defaults
-                    self.timestamp = (
-                        datetime.fromtimestamp(self.updateTime / 1000) 
-                        if hasattr(self, 'updateTime') and self.updateTime 
-                        else None
-                    )
-                    self.order_id = getattr(self, 'orderId', None)
-                    # Handle price conversion safely
-                    price_val = getattr(self, 'price', '0')
-                    self.price = float(price_val) if price_val and price_val != '0' else None
-                    # Handle quantity conversion safely
-                    qty_val = getattr(self, 'origQty', '0')
-                    self.quantity = float(qty_val) if qty_val and qty_val != '0' else None
-                    self.status = getattr(self, 'status', 'Unknown')
-                    self.side = getattr(self, 'side', 'Unknown')
-                    self.symbol = getattr(self, 'symbol', 'Unknown')
-                    self.order_type = getattr(self, 'type', 'Unknown')
-                    # Additional futures-specific fields
-                    self.position_side = getattr(self, 'positionSide', 'BOTH')
-                    self.reduce_only = getattr(self, 'reduceOnly', False)
-                    self.close_position = getattr(self, 'closePosition', False)
-            return [OrderObj(o) for o in orders]
+                symbols = symbols[:max_symbols]
+                per_symbol = min(limit, 100)  # Limit per symbol
+                if on_loop_thread():
+                    # Can't wait on the monitor loop from inside it; fan out on threads instead
+                    orders = self._fetch_all_orders_threaded(symbols, per_symbol)
+                else:
+                    # Fetch every symbol concurrently on the monitor loop instead of one by one
+                    orders = schedule(self._fetch_all_orders(symbols, per_symbol)).result()
+            # Most recent first; only the orders being returned are parsed
+            orders = heapq.nlargest(limit, orders, key=lambda o: o.get('updateTime', 0))
+            return [_parse_order(o) for o in orders]
         except Exception as e:
             self.logger.error(f"Error fetching order history: {e}")
             return []
+    async def _fetch_all_orders(self, symbols, limit):
+        """Fetch all orders for each symbol concurrently, skipping symbols that fail"""
+        get_all_orders = rest_method('futures_get_all_orders', self.client, self.executor, self.async_client)
+        semaphore = asyncio.Semaphore(HISTORY_CONCURRENCY)
+        
+        async def fetch(sym):
+            async with semaphore:
+                try:
+                    return await get_all_orders(symbol=sym, limit=limit)
+                except Exception as e:
+                    self.logger.warning(f"Skipping symbol {sym}: {e}")
+                    return None
+        
+        results = await asyncio.gather(*(fetch(sym) for sym in symbols))
+        orders = []
+        processed_symbols = 0
+        for sym_orders in results:
+            if sym_orders is not None:
+                orders.extend(sym_orders)
+                processed_symbols += 1
+        self.logger.info(f"Processed {processed_symbols} symbols")
+        return orders
+    
+    def _fetch_all_orders_threaded(self, symbols, limit):
+        """Thread-pool variant of _fetch_all_orders for callers already on the monitor loop"""
+        orders = []
+        processed_symbols = 0
+        with ThreadPoolExecutor(max_workers=HISTORY_CONCURRENCY) as pool:
+            futures = {
+                pool.submit(self.client.futures_get_all_orders, symbol=sym, limit=limit): sym
+                for sym in symbols
+            }
+            for future in as_completed(futures):
+                try:
+                    orders.extend(future.result())
+                    processed_symbols += 1
+                except Exception as e:
+                    self.logger.warning(f"Skipping symbol {futures[future]}: {e}")
+        self.logger.info(f"Processed {processed_symbols} symbols")
+        return orders
+    
     def __init__(self):
         self.api_key = os.getenv('BINANCE_API_KEY')
         self.api_secret = os.getenv('BINANCE_API_SECRET')
@@ -96,28 +169,77 @@ class TradingBot:
             raise ValueError("API credentials not found")
         
         self._setup_logging()
-        self.client = Client(self.api_key, self.api_secret, testnet=self.testnet)
-        self.order_history = []
+        # One request-weight budget per IP, drawn on by both REST clients
+        self.rate_limiter = WeightLimiter()
+        self.client = TradingClient(
+            self.api_key, self.api_secret, testnet=self.testnet, requests_params={'timeout': 5},
+            pool_size=POOL_SIZE, limiter=self.rate_limiter
+        )
+        # Same account on the monitor loop, for REST calls its coroutines await directly
+        self.async_client = schedule(
+            open_async_client(self.api_key, self.api_secret, testnet=self.testnet, pool_size=POOL_SIZE,
+                              limiter=self.rate_limiter)
+        ).result()
+        atexit.register(self._close_async_client)
+        self.order_history = OrderHistory()
+        self.exchange_info = ExchangeInfoCache(self.client)
+        self.prices = PriceCache(self.client)
+        
+        # Shared, bounded pool for blocking REST calls made by background monitors
+        self.executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix='mon')
+        
+        # Push-based order updates; handlers fall back to polling if it is unavailable
+        self.user_stream = UserDataStream(self.api_key, self.api_secret, testnet=self.testnet)
         
         # Initialize handlers
-        self.market_orders = MarketOrderHandler(self.client)
-        self.limit_orders = LimitOrderHandler(self.client)
-        self.oco_orders = OCOOrderHandler(self.client, self.limit_orders)
-        self.twap_orders = TWAPOrderHandler(self.market_orders)
-        self.grid_orders = GridOrderHandler(self.client, self.limit_orders)
+        self.market_orders = MarketOrderHandler(
+            self.client, user_stream=self.user_stream, prices=self.prices, exchange_info=self.exchange_info
+        )
+        self.limit_orders = LimitOrderHandler(
+            self.client, self.exchange_info, user_stream=self.user_stream, prices=self.prices
+        )
+        self.oco_orders = OCOOrderHandler(
+            self.client, self.limit_orders, self.executor, user_stream=self.user_stream,
+            async_client=self.async_client
+        )
+        self.twap_orders = TWAPOrderHandler(self.market_orders, self.executor)
+        self.grid_orders = GridOrderHandler(
+            self.client, self.limit_orders, self.executor, user_stream=self.user_stream,
+            async_client=self.async_client
+        )
         
         self._validate_connection()
+        self.user_stream.start()
+    
+    def _close_async_client(self):
+        try:
+            schedule(self.async_client.close_connection()).result(timeout=1)
+        except Exception:
+            pass  # exiting anyway; the session dies with the process
     
     def _setup_logging(self):
+        # Callers only enqueue records; file and console writes happen on the listener thread,
+        # and bot.log is flushed once per burst rather than once per record.
+        # It rotates at LOG_MAX_BYTES so a long session never grows one unbounded file
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [
+            BufferedRotatingFileHandler('bot.log', mode='a', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS),
+            logging.StreamHandler(sys.stdout)
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))  # full layout applied by the listener
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('bot.log', mode='a'),
-                logging.StreamHandler(sys.stdout)
-            ],
+            handlers=[queue_handler],
             force=True
         )
+        self.log_listener = DrainingQueueListener(log_queue, *handlers)
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)  # flush queued records on exit
         self.logger = logging.getLogger("TradingBot")
     
     def _validate_connection(self):
@@ -144,74 +266,112 @@ class TradingBot:
         ticker = self.client.futures_symbol_ticker(symbol=symbol)
         return float(ticker['price'])
     
-    def monitor_price(self, symbol: str, duration: int = 0, callback=None):
-        """Monitor price continuously with optional duration in seconds"""
-        start_time = time.time()
+    def monitor_price(self, symbol: str, duration: int = 0, callback=None, stop_event=None):
+        """Monitor price continuously with optional duration in seconds, until stop_event is set.
+        Prices are the best bid/ask midpoint pushed by the bookTicker stream; the ticker is
+        polled once a second instead if the stream can't be opened, drops, or goes quiet
+        for BOOK_TICKER_TIMEOUT seconds."""
+        deadline = time.monotonic_ns() + duration * 1_000_000_000 if duration else None
+        stop_event = stop_event or threading.Event()
+        failed = threading.Event()
+        last_tick = [0]  # monotonic ns of the latest update; a stream that goes quiet counts as failed
+        
+        def on_tick(msg):
+            if msg.get('e') == 'error':
+                self.logger.warning("Book ticker stream error for %s: %s", symbol, msg.get('m'))
+                failed.set()
+            elif 'b' in msg:
+                last_tick[0] = time.monotonic_ns()
+                if callback:
+                    price = (float(msg['b']) + float(msg['a'])) / 2
+                    callback(symbol, price, _clock(time.time_ns() // 1_000_000_000))
+        
+        key = self.user_stream.start_book_ticker(symbol, on_tick)
+        if key is not None:
+            try:
+                last_tick[0] = time.monotonic_ns()  # timed from once the socket is streaming
+                while not stop_event.wait(0.2) and not failed.is_set():
+                    now = time.monotonic_ns()
+                    if deadline and now >= deadline:
+                        return
+                    if now - last_tick[0] >= BOOK_TICKER_TIMEOUT * 1_000_000_000:
+                        self.logger.warning("No book ticker update for %s in %ss, polling instead",
+                                            symbol, BOOK_TICKER_TIMEOUT)
+                        break
+            except KeyboardInterrupt:
+                return
+            finally:
+                self.user_stream.stop_socket(key)
+            if stop_event.is_set():
+                return
+        
         try:
             while True:
                 price = self.get_current_price(symbol)
-                timestamp = datetime.now().strftime('%H:%M:%S')
+                timestamp = _clock(time.time_ns() // 1_000_000_000)
                 
                 if callback:
                     callback(symbol, price, timestamp)
                 
-                if duration and (time.time() - start_time) >= duration:
+                if deadline and time.monotonic_ns() >= deadline:
+                    break
+                
+                # 1 second delay between updates
+                if stop_event.wait(1):
                     break
-                    
-                time.sleep(1)  # 1 second delay between updates
                 
         except KeyboardInterrupt:
             return
     
     def get_symbol_info(self, symbol):
         """
-        Get symbol information using python-binance library
+        Get futures symbol information from the shared exchange info cache
         """
         try:
-            # Get exchange info
-            exchange_info = self.client.get_exchange_info()
-            
-            # Find the specific symbol
-            symbol_info = None
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    symbol_info = s
-                    break
+            # Indexed futures exchange info, shared with the order handlers
+            symbol_info = self.exchange_info.get(symbol)
             
             if not symbol_info:
                 raise Exception(f"Symbol {symbol} not found")
             
-            # Extract precision and filter data
-            symbol_data = {
-                'symbol': symbol,
-                'status': symbol_info['status'],
-                'base_asset': symbol_info['baseAsset'],
-                'quote_asset': symbol_info['quoteAsset'],
-                'price_precision': symbol_info.get('quotePrecision', 8),
-                'quantity_precision': symbol_info.get('baseAssetPrecision', 8),
-                'min_quantity': 0,
-                'max_quantity': None,
-                'step_size': 0,
-                'min_price': 0,
-                'max_price': None,
-                'tick_size': 0
-            }
-            
-            # Parse filters
-            for filter_info in symbol_info['filters']:
-                filter_type = filter_info['filterType']
-                
-                if filter_type == 'LOT_SIZE':
-                    symbol_data['min_quantity'] = float(filter_info['minQty'])
-                    symbol_data['max_quantity'] = float(filter_info['maxQty']) if filter_info['maxQty'] != '0' else None
-                    symbol_data['step_size'] = float(filter_info['stepSize'])
-                    
-                elif filter_type == 'PRICE_FILTER':
-                    symbol_data['min_price'] = float(filter_info['minPrice'])
-                    symbol_data['max_price'] = float(filter_info['maxPrice']) if filter_info['maxPrice'] != '0' else None
-                    symbol_data['tick_size'] = float(filter_info['tickSize'])
-            
-            return symbol_data
+            return self._parse_symbol_info(symbol_info)
             
         except Exception as e:
             raise Exception(f"Error fetching symbol info for {symbol}: {str(e)}")
+    
+    def get_all_symbol_info(self):
+        """Parsed symbol information for every symbol, from the shared exchange info cache"""
+        return {symbol: self._parse_symbol_info(s) for symbol, s in self.exchange_info.symbols().items()}
+    
+    def _parse_symbol_info(self, symbol_info):
+        # Extract precision and filter data
+        symbol_data = {
+            'symbol': symbol_info['symbol'],
+            'status': symbol_info['status'],
+            'base_asset': symbol_info['baseAsset'],
+            'quote_asset': symbol_info['quoteAsset'],
+            'price_precision': symbol_info.get('quotePrecision', 8),
+            'quantity_precision': symbol_info.get('baseAssetPrecision', 8),
+            'min_quantity': 0,
+            'max_quantity': None,
+            'step_size': 0,
+            'min_price': 0,
+            'max_price': None,
+            'tick_size': 0
+        }
+        
+        # Parse filters
+        for filter_info in symbol_info['filters']:
+            filter_type = filter_info['filterType']
+            
+            if filter_type == 'LOT_SIZE':
+                symbol_data['min_quantity'] = float(filter_info['minQty'])
+                symbol_data['max_quantity'] = float(filter_info['maxQty']) if filter_info['maxQty'] != '0' else None
+                symbol_data['step_size'] = float(filter_info['stepSize'])
+                
+            elif filter_type == 'PRICE_FILTER':
+                symbol_data['min_price'] = float(filter_info['minPrice'])
+                symbol_data['max_price'] = float(filter_info['maxPrice']) if filter_info['maxPrice'] != '0' else None
+                symbol_data['tick_size'] = float(filter_info['tickSize'])
+        
+        return symbol_data
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from binance import BinanceSocketManager, ThreadedWebsocketManager
+from binance import streams
+from binance.exceptions import BinanceWebsocketUnableToConnect
+
+try:
+    import orjson
+except ImportError:  # python-binance keeps decoding frames with stdlib json
+    orjson = None
+else:
+    # streams only calls json.loads (on each frame); orjson accepts the same str/bytes input
+    # and its decode error subclasses ValueError, which is what the socket code catches
+    streams.json = orjson
+
+FINAL_STATUSES = frozenset(('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED'))
+# Listen keys expire 60 minutes after the last keepalive; Binance recommends one every 30.
+# python-binance defaults to every 5 minutes, two REST calls each time
+LISTEN_KEY_KEEPALIVE = 30 * 60
+# Seconds a new socket gets to fetch its listen key (user sockets) and connect
+SOCKET_CONNECT_TIMEOUT = 5
+
+
+class _UserSocketManager(ThreadedWebsocketManager):
+    """ThreadedWebsocketManager whose socket manager refreshes the listen key every LISTEN_KEY_KEEPALIVE"""
+
+    async def _before_socket_listener_start(self):
+        assert self._client
+        self._bsm = BinanceSocketManager(client=self._client, user_timeout=LISTEN_KEY_KEEPALIVE)
+
+    async def _build_socket(self, socket_name: str, params: dict):
+        return getattr(self._bsm, socket_name)(**params)
+
+    def _start_async_socket(self, callback, socket_name, params, path=None):
+        """Start socket_name and return its key once it is streaming.
+
+        Raises BinanceWebsocketUnableToConnect if it isn't within SOCKET_CONNECT_TIMEOUT:
+        the listen key request and the connect both run later on the manager loop, and
+        a failure there reaches neither the caller nor the socket's callback.
+        """
+        deadline = time.monotonic() + SOCKET_CONNECT_TIMEOUT
+        while not self._bsm:
+            if time.monotonic() >= deadline:
+                raise BinanceWebsocketUnableToConnect("Socket manager did not start")
+            time.sleep(0.1)
+        # The base class builds the socket on the calling thread, and the socket binds to that
+        # thread's event loop: a fresh, never-run one on a worker thread, so no frame would
+        # ever arrive. Build it on the manager loop the listener runs on instead.
+        socket = asyncio.run_coroutine_threadsafe(
+            self._build_socket(socket_name, params), self._loop
+        ).result(SOCKET_CONNECT_TIMEOUT)
+        socket_path = path or socket._path
+        self._socket_running[socket_path] = True
+        self._loop.call_soon_threadsafe(asyncio.create_task, self.start_listener(socket, socket_path, callback))
+        while socket.ws_state != streams.WSListenerState.STREAMING:
+            if time.monotonic() >= deadline:
+                self.stop_socket(socket_path)
+                raise BinanceWebsocketUnableToConnect(f"{socket_name} did not connect in {SOCKET_CONNECT_TIMEOUT}s")
+            time.sleep(0.05)
+        return socket_path
+
+
+class UserDataStream:
+    """Dispatches futures ORDER_TRADE_UPDATE events to per-order callbacks"""
+
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False, backlog: int = 1000):
+        self.logger = logging.getLogger("UserDataStream")
+        self._twm = _UserSocketManager(api_key=api_key, api_secret=api_secret, testnet=testnet)
+        self._twm.daemon = True
+        self._callbacks: Dict[int, Callable[[dict], None]] = {}
+        self._recent: OrderedDict = OrderedDict()  # orderId -> last update, replayed on late register
+        self._backlog = backlog
+        self._failure_handlers: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self.active = False
+
+    def start(self) -> bool:
+        try:
+            self._twm.start()
+            # Returns only once the socket is streaming, so a failed listen key or
+            # connect leaves the stream inactive and callers poll instead
+            self._twm.start_futures_user_socket(callback=self._handle_message)
+            self.active = True
+            self.logger.info("User data stream started")
+        except Exception as e:
+            self.logger.warning("User data stream unavailable, using polling: %s", e)
+            self.active = False
+        return self.active
+
+    def stop(self):
+        self.active = False
+        try:
+            self._twm.stop()
+        except Exception as e:
+            self.logger.warning("Error stopping user data stream: %s", e)
+
+    def register(self, order_id: int, callback: Callable[[dict], None]):
+        """Route updates for order_id to callback, replaying one that already arrived"""
+        with self._lock:
+            self._callbacks[order_id] = callback
+            missed = self._recent.get(order_id)
+        if missed:
+            self._dispatch(callback, missed)
+
+    def unregister(self, order_id: int):
+        with self._lock:
+            self._callbacks.pop(order_id, None)
+
+    def wait_for_final(self, order_id: int, timeout: float) -> Optional[dict]:
+        """Block until order_id reaches a final status and return that update, or None on timeout"""
+        done = threading.Event()
+        final = []
+        
+        def on_update(update):
+            if update['X'] in FINAL_STATUSES:
+                final.append(update)
+                done.set()
+        
+        self.register(order_id, on_update)
+        try:
+            done.wait(timeout)
+        finally:
+            self.unregister(order_id)
+        return final[0] if final else None
+
+    def start_book_ticker(self, symbol: str, callback: Callable[[dict], None]) -> Optional[str]:
+        """Push symbol's best bid/ask updates to callback over the same socket manager.
+        Returns the socket key for stop_socket, or None if market streams are unavailable.
+        A public market stream, so it doesn't depend on the user data stream being up."""
+        try:
+            # Combined-stream frames wrap the ticker in 'data'; errors arrive unwrapped
+            return self._twm.start_symbol_ticker_futures_socket(
+                callback=lambda msg: callback(msg.get('data', msg)), symbol=symbol
+            )
+        except Exception as e:
+            self.logger.warning("Book ticker stream unavailable for %s: %s", symbol, e)
+            return None
+
+    def stop_socket(self, key: str):
+        self._twm.stop_socket(key)
+
+    def add_failure_handler(self, handler: Callable[[], None]):
+        """Call handler once if the stream dies, so callers can resume polling"""
+        self._failure_handlers.append(handler)
+
+    def _handle_message(self, msg: dict):
+        event = msg.get('e')
+        if event == 'error':
+            self._fail(msg.get('m', msg))
+            return
+        if event != 'ORDER_TRADE_UPDATE':
+            return
+
+        update = msg['o']
+        order_id = update['i']
+        with self._lock:
+            self._recent[order_id] = update
+            self._recent.move_to_end(order_id)
+            if len(self._recent) > self._backlog:
+                self._recent.popitem(last=False)
+            callback = self._callbacks.get(order_id)
+        if callback:
+            self._dispatch(callback, update)
+
+    def _dispatch(self, callback: Callable[[dict], None], update: dict):
+        try:
+            callback(update)
+        except Exception as e:
+            self.logger.error("Order update callback error: %s", e)
+
+    def _fail(self, reason):
+        if not self.active:
+            return
+        self.active = False
+        self.logger.error("User data stream failed, falling back to polling: %s", reason)
+        for handler in self._failure_handlers:
+            try:
+                handler()
+            except Exception as e:
+                self.logger.error("Stream failure handler error: %s", e)